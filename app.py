@@ -8,12 +8,21 @@ Features:
 
 import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine, text
+import numpy as np
+from sqlalchemy import create_engine
 import plotly.express as px
 from src.workflow.graph import text_to_sql_workflow
+from src.agents.state import INITIAL_STATE
 from src.config import get_settings
 from src.schema.schema_extractor import SchemaExtractor
 import time
+import asyncio
+import tempfile
+import uuid
+import shutil
+from pathlib import Path
+import threading
+import re
 
 # Page configuration
 st.set_page_config(
@@ -66,53 +75,350 @@ if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
 if 'query_history' not in st.session_state:
     st.session_state.query_history = []
+if 'pending_query' not in st.session_state:
+    st.session_state.pending_query = None
+if 'sql_result' not in st.session_state:
+    st.session_state.sql_result = None
+
+# Chat messages kept fully in memory; older results are spilled to Parquet files
+CHAT_HISTORY_LIMIT = 20
+CHAT_CACHE_DIR = Path(tempfile.gettempdir()) / "nlp_to_sql_chat_cache"
+# Spill directories untouched for this long belong to ended sessions
+CHAT_CACHE_MAX_AGE_SECONDS = 24 * 60 * 60
+
+# Seconds between chat panel refreshes while a workflow is running
+CHAT_POLL_SECONDS = 0.3
+
+def _remove_stale_chat_caches():
+    """Delete spill directories of sessions that ended without clearing their chat."""
+    # Streamlit has no session-end hook, so sessions sweep up after old ones as they start
+    cutoff = time.time() - CHAT_CACHE_MAX_AGE_SECONDS
+    try:
+        session_dirs = list(CHAT_CACHE_DIR.iterdir())
+    except OSError:
+        return
+    for session_dir in session_dirs:
+        try:
+            if session_dir.stat().st_mtime < cutoff:
+                shutil.rmtree(session_dir, ignore_errors=True)
+        except OSError:
+            pass
+
+# Each session spills into its own directory
+if 'chat_cache_dir' not in st.session_state:
+    _remove_stale_chat_caches()
+    st.session_state.chat_cache_dir = CHAT_CACHE_DIR / uuid.uuid4().hex
 
 # Load settings
+SETTINGS = get_settings()
+_HAS_KEY = bool(SETTINGS.openai_api_key) and SETTINGS.openai_api_key != "your_openai_api_key_here"
+
 @st.cache_resource
 def get_db_connection():
     """Get database connection."""
-    settings = get_settings()
-    engine = create_engine(settings.database_url)
+    engine = create_engine(
+        SETTINGS.database_url,
+        pool_size=5,
+        max_overflow=2,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
     return engine
 
+@st.cache_resource
+def get_workflow_loop():
+    """Get the shared event loop that runs chatbot workflows off the script thread."""
+    # One long-lived loop keeps the async LLM client's connection pool usable across runs
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
 @st.cache_resource
 def get_schema_info():
     """Get database schema information."""
-    settings = get_settings()
-    extractor = SchemaExtractor(settings.database_url)
+    extractor = SchemaExtractor(SETTINGS.database_url)
     return extractor
 
+@st.cache_data(ttl=3600)
+def _cached_tables(db_url: str):
+    """Get table names, cached per database URL across reruns."""
+    return get_schema_info().get_table_names()
+
+@st.cache_data(ttl=3600)
+def _cached_schema(db_url: str):
+    """Get full schema DDL, cached per database URL across reruns."""
+    return get_schema_info().get_full_schema()
+
+def downcast_integers(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink integer columns to the narrowest dtype to cut the Arrow payload."""
+    # Floats are left alone: float32 would change the values written to CSV
+    for col, dtype in zip(df.columns, df.dtypes):
+        if dtype.kind in "iu":
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def _run_select(query: str) -> pd.DataFrame:
+    """Run a SELECT query, cached by its exact text (whitespace in literals is significant)."""
+    engine = get_db_connection()
+    with engine.connect() as conn:
+        # Use the raw DBAPI cursor to skip SQLAlchemy's per-row processing
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(query)
+            columns = [d[0] for d in cursor.description]
+            
+            # Fetch in batches so large results are not buffered twice
+            frames = []
+            while True:
+                rows = cursor.fetchmany(10_000)
+                if not rows:
+                    break
+                frames.append(pd.DataFrame.from_records(rows, columns=columns))
+        finally:
+            cursor.close()
+    
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    return downcast_integers(df)
+
+_READONLY_RE = re.compile(r"\s*(SELECT|WITH|EXPLAIN|SHOW)\b", re.IGNORECASE)
+
+# Literals, quoted identifiers, comments, words and single characters, in that order
+_SQL_TOKEN_RE = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`|\[[^\]]*\]|--[^\n]*|/\*.*?\*/|\w+|\S",
+    re.DOTALL
+)
+_READ_STATEMENTS = {"SELECT", "VALUES", "SHOW"}
+_WRITE_STATEMENTS = {
+    "INSERT", "UPDATE", "DELETE", "REPLACE", "MERGE", "UPSERT", "DROP", "ALTER", "CREATE",
+    "TRUNCATE", "ATTACH", "DETACH", "PRAGMA", "VACUUM", "REINDEX", "GRANT", "REVOKE"
+}
+
+def _statement_keyword(query: str) -> str:
+    """Keyword of the statement a WITH or EXPLAIN query actually runs ("" if none)."""
+    # CTE bodies and EXPLAIN options sit in parentheses; the first statement keyword
+    # outside them is the main statement, so scanning stops there
+    depth = 0
+    for match in _SQL_TOKEN_RE.finditer(query):
+        token = match.group()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and (token[0].isalpha() or token[0] == "_"):
+            keyword = token.upper()
+            if keyword in _READ_STATEMENTS or keyword in _WRITE_STATEMENTS:
+                return keyword
+    return ""
+
+def is_read_only(query: str) -> bool:
+    """Check that a query is a read-only statement without copying the query text."""
+    match = _READONLY_RE.match(query)
+    if not match:
+        return False
+    # CTEs and EXPLAIN can wrap a write statement; check the statement they wrap
+    keyword = match.group(1).upper()
+    return keyword in ("SELECT", "SHOW") or _statement_keyword(query) in _READ_STATEMENTS
+
 def execute_sql_query(query: str):
     """Execute a SQL query and return results."""
+    # Check that it's a read-only query before it reaches the database
+    if not is_read_only(query):
+        return None, "Only read-only queries (SELECT, WITH, EXPLAIN, SHOW) are allowed for safety."
+    
     try:
-        engine = get_db_connection()
-        with engine.connect() as conn:
-            result = conn.execute(text(query))
-            
-            # Check if it's a SELECT query
-            if query.strip().upper().startswith('SELECT'):
-                columns = result.keys()
-                rows = result.fetchall()
-                df = pd.DataFrame(rows, columns=columns)
-                return df, None
-            else:
-                return None, "Only SELECT queries are allowed for safety."
+        # Errors are raised out of the cached function, so they are never cached
+        df = _run_select(query.strip())
+        return df, None
     except Exception as e:
         return None, str(e)
 
+def fast_to_csv(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame to CSV bytes, column-wise for all-numeric frames."""
+    kinds = [dtype.kind for dtype in df.dtypes]
+    if df.empty or any(k not in "iuf" for k in kinds) or df.isna().any().any():
+        return df.to_csv(index=False).encode()
+    
+    # Stringify each column in one NumPy call, then glue columns with commas
+    header = df.head(0).to_csv(index=False)
+    lines = df.iloc[:, 0].to_numpy().astype(str)
+    for col in range(1, df.shape[1]):
+        lines = np.char.add(np.char.add(lines, ","), df.iloc[:, col].to_numpy().astype(str))
+    
+    return (header + "\n".join(lines.tolist()) + "\n").encode()
+
+def _message_results(message: dict):
+    """Get a chat message's results as (DataFrame, CSV bytes), built once per message."""
+    results = message["results"]
+    
+    # Spilled results are read back from disk only when the message is rendered
+    if isinstance(results, str):
+        try:
+            return _load_spilled_results(results)
+        except OSError:
+            # Swept up as stale by another session
+            return pd.DataFrame(), b""
+    
+    # Memoized on the message itself so history reruns skip re-serialization
+    if "df" not in message:
+        message["df"] = downcast_integers(pd.DataFrame(results))
+        message["csv"] = fast_to_csv(message["df"])
+    return message["df"], message["csv"]
+
+_KEYWORD_BREAK_RE = re.compile(
+    r"\s+(SELECT|FROM|WHERE|INNER\s+JOIN|LEFT\s+JOIN|RIGHT\s+JOIN|JOIN|"
+    r"GROUP\s+BY|ORDER\s+BY|HAVING|LIMIT)\s+",
+    re.IGNORECASE
+)
+
 def format_query_for_display(sql: str) -> str:
     """Format SQL query for nice display."""
-    # Simple formatting
-    keywords = ['SELECT', 'FROM', 'WHERE', 'JOIN', 'LEFT JOIN', 'RIGHT JOIN', 
-                'INNER JOIN', 'GROUP BY', 'ORDER BY', 'HAVING', 'LIMIT']
-    
-    formatted = sql
-    for keyword in keywords:
-        formatted = formatted.replace(f' {keyword} ', f'\n{keyword} ')
-        formatted = formatted.replace(f' {keyword.lower()} ', f'\n{keyword} ')
+    # Single pass: break the line before each clause keyword and upper-case it
+    formatted = _KEYWORD_BREAK_RE.sub(lambda m: "\n" + " ".join(m.group(1).split()).upper() + " ", sql)
     
     return formatted.strip()
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def _load_spilled_results(path: str):
+    """Read spilled results back as (DataFrame, CSV bytes); spill files never change, so cache by path."""
+    df = downcast_integers(pd.read_parquet(path))
+    return df, fast_to_csv(df)
+
+def _spill_to_disk(message: dict):
+    """Move an old message's results to a Parquet file, leaving its path behind."""
+    results = message.get("results")
+    if not isinstance(results, list) or not results:
+        return
+    
+    try:
+        session_dir = st.session_state.chat_cache_dir
+        session_dir.mkdir(parents=True, exist_ok=True)
+        path = session_dir / f"{uuid.uuid4().hex}.parquet"
+        pd.DataFrame(results).to_parquet(path, index=False)
+    except Exception:
+        # Keep the results in memory if they cannot be written
+        return
+    
+    message["results"] = str(path)
+    message.pop("df", None)
+    message.pop("csv", None)
+
+def append_chat_message(message: dict):
+    """Append to the chat history, spilling results of messages past the in-memory limit."""
+    history = st.session_state.chat_history
+    history.append(message)
+    for old in history[:-CHAT_HISTORY_LIMIT]:
+        _spill_to_disk(old)
+
+RECENT_CHAT_MESSAGES = 10
+
+def render_chat_message(i: int, message: dict):
+    """Render one chat history message."""
+    if message["role"] == "user":
+        st.markdown(f'<div class="info-box">👤 <b>You:</b> {message["content"]}</div>', unsafe_allow_html=True)
+    
+    else:  # assistant
+        st.markdown('<div class="sql-box">', unsafe_allow_html=True)
+        st.markdown("🤖 **AI Assistant**")
+        
+        if message.get("success"):
+            # Show SQL
+            st.markdown("**Generated SQL:**")
+            st.code(message["sql"], language="sql")
+            
+            if message.get("corrections", 0) > 0:
+                st.info(f"ℹ️ Query was corrected {message['corrections']} time(s)")
+            
+            # Show results
+            results = message["results"]
+            if results:
+                df, csv = _message_results(message)
+                st.success(f"✅ Success! ({len(df)} rows)")
+                
+                st.dataframe(df, use_container_width=True, hide_index=True)
+                
+                # Download option
+                st.download_button(
+                    label="📥 Download",
+                    data=csv,
+                    file_name=f"results_{i}.csv",
+                    mime="text/csv",
+                    key=f"download_{i}"
+                )
+            else:
+                st.warning("No results found.")
+        
+        else:
+            st.error(f"❌ Error: {message.get('error', 'Unknown error occurred')}")
+            if message.get("sql"):
+                st.markdown("**Attempted SQL:**")
+                st.code(message["sql"], language="sql")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown("---")
+
+def chat_panel():
+    """
+    Collect a finished background workflow and render the conversation.
+    
+    Runs as a fragment that reruns on a timer while a workflow is pending, so
+    polling redraws only this panel and leaves the SQL Query tab alone.
+    """
+    # Collect a finished background workflow
+    pending = st.session_state.pending_query
+    if pending is not None and pending.done():
+        st.session_state.pending_query = None
+        
+        try:
+            final_state = pending.result()
+            
+            # Extract results
+            generated_sql = final_state.get("final_sql", final_state.get("generated_sql", "N/A"))
+            execution_successful = final_state.get("execution_successful", False)
+            query_results = final_state.get("query_results", [])
+            execution_error = final_state.get("execution_error")
+            correction_attempts = final_state.get("correction_attempt", 0)
+            
+            # Create response
+            response = {
+                "role": "assistant",
+                "sql": generated_sql,
+                "success": execution_successful,
+                "results": query_results,
+                "error": execution_error,
+                "corrections": correction_attempts
+            }
+            
+            append_chat_message(response)
+            
+        except Exception as e:
+            append_chat_message({
+                "role": "assistant",
+                "error": str(e),
+                "success": False
+            })
+        
+        # Full rerun, so the panel is redefined without polling
+        st.rerun()
+    
+    # Display chat history
+    if st.session_state.chat_history:
+        st.markdown("### 💬 Conversation")
+        
+        # Only the latest messages are rendered unless the user asks for more,
+        # so reruns do not redraw every DataFrame in a long conversation
+        history = st.session_state.chat_history
+        first = max(0, len(history) - RECENT_CHAT_MESSAGES)
+        if first and st.toggle("Show earlier messages", key="show_earlier_messages"):
+            first = 0
+        
+        for i in range(first, len(history)):
+            render_chat_message(i, history[i])
+    
+    if st.session_state.pending_query is not None:
+        st.info("🤔 Thinking...")
+
 # Main header
 st.markdown('<div class="main-header">🤖 NLP-to-SQL Chatbot</div>', unsafe_allow_html=True)
 st.markdown("---")
@@ -122,8 +428,7 @@ with st.sidebar:
     st.header("📊 Database Info")
     
     try:
-        extractor = get_schema_info()
-        tables = extractor.get_table_names()
+        tables = _cached_tables(SETTINGS.database_url)
         
         st.success(f"✅ Connected to database")
         st.metric("Tables", len(tables))
@@ -133,7 +438,7 @@ with st.sidebar:
                 st.write(f"• {table}")
         
         with st.expander("🔍 View Full Schema"):
-            schema = extractor.get_full_schema()
+            schema = _cached_schema(SETTINGS.database_url)
             st.code(schema, language="sql")
     
     except Exception as e:
@@ -142,9 +447,8 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("### ⚙️ Settings")
     
-    settings = get_settings()
-    st.info(f"**Model:** {settings.llm_model}")
-    st.info(f"**Max Corrections:** {settings.max_correction_attempts}")
+    st.info(f"**Model:** {SETTINGS.llm_model}")
+    st.info(f"**Max Corrections:** {SETTINGS.max_correction_attempts}")
 
 # Main tabs
 tab1, tab2 = st.tabs(["🔍 SQL Query", "💬 AI Chatbot"])
@@ -152,7 +456,7 @@ tab1, tab2 = st.tabs(["🔍 SQL Query", "💬 AI Chatbot"])
 # ==================== TAB 1: SQL Query ====================
 with tab1:
     st.header("Direct SQL Query Interface")
-    st.markdown("Execute SQL queries directly against the database. Only SELECT queries are allowed.")
+    st.markdown("Execute SQL queries directly against the database. Only read-only queries (SELECT, WITH, EXPLAIN, SHOW) are allowed.")
     
     # SQL input
     col1, col2 = st.columns([4, 1])
@@ -190,51 +494,57 @@ LIMIT 5"""
         if sql_query.strip():
             with st.spinner("Executing query..."):
                 df, error = execute_sql_query(sql_query)
-                
-                if error:
-                    st.markdown(f'<div class="error-box">❌ Error: {error}</div>', unsafe_allow_html=True)
-                else:
-                    # Display results
-                    st.markdown(f'<div class="success-box">✅ Query executed successfully! ({len(df)} rows returned)</div>', unsafe_allow_html=True)
-                    
-                    # Show data
-                    st.dataframe(df, use_container_width=True, height=400)
-                    
-                    # Download button
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download as CSV",
-                        data=csv,
-                        file_name="query_results.csv",
-                        mime="text/csv"
-                    )
-                    
-                    # Visualization options if numeric columns exist
-                    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
-                    if numeric_cols and len(df) > 1:
-                        st.markdown("### 📊 Quick Visualization")
-                        
-                        viz_type = st.selectbox("Chart Type", ["Bar Chart", "Line Chart", "Pie Chart"])
-                        
-                        if viz_type == "Bar Chart" and len(df) <= 20:
-                            x_col = st.selectbox("X-axis", df.columns.tolist())
-                            y_col = st.selectbox("Y-axis", numeric_cols)
-                            fig = px.bar(df, x=x_col, y=y_col, title=f"{y_col} by {x_col}")
-                            st.plotly_chart(fig, use_container_width=True)
-                        
-                        elif viz_type == "Line Chart":
-                            x_col = st.selectbox("X-axis", df.columns.tolist())
-                            y_col = st.selectbox("Y-axis", numeric_cols)
-                            fig = px.line(df, x=x_col, y=y_col, title=f"{y_col} trend")
-                            st.plotly_chart(fig, use_container_width=True)
-                        
-                        elif viz_type == "Pie Chart" and len(df) <= 10:
-                            label_col = st.selectbox("Labels", df.columns.tolist())
-                            value_col = st.selectbox("Values", numeric_cols)
-                            fig = px.pie(df, names=label_col, values=value_col, title=f"{value_col} distribution")
-                            st.plotly_chart(fig, use_container_width=True)
+                # Serialized once here rather than on every rerun that redraws the result
+                st.session_state.sql_result = (df, error, fast_to_csv(df) if df is not None else None)
         else:
+            st.session_state.sql_result = None
             st.warning("⚠️ Please enter a SQL query.")
+    
+    # Kept in session state so later reruns (chart controls, chatbot updates) don't clear it
+    if st.session_state.sql_result is not None:
+        df, error, csv = st.session_state.sql_result
+        
+        if error:
+            st.markdown(f'<div class="error-box">❌ Error: {error}</div>', unsafe_allow_html=True)
+        else:
+            # Display results
+            st.markdown(f'<div class="success-box">✅ Query executed successfully! ({len(df)} rows returned)</div>', unsafe_allow_html=True)
+            
+            # Show data
+            st.dataframe(df, use_container_width=True, height=400, hide_index=True)
+            
+            # Download button
+            st.download_button(
+                label="📥 Download as CSV",
+                data=csv,
+                file_name="query_results.csv",
+                mime="text/csv"
+            )
+            
+            # Visualization options if numeric columns exist
+            numeric_cols = [col for col, dtype in zip(df.columns, df.dtypes) if dtype.kind in "iuf"]
+            if numeric_cols and len(df) > 1:
+                st.markdown("### 📊 Quick Visualization")
+                
+                viz_type = st.selectbox("Chart Type", ["Bar Chart", "Line Chart", "Pie Chart"])
+                
+                if viz_type == "Bar Chart" and len(df) <= 20:
+                    x_col = st.selectbox("X-axis", df.columns.tolist())
+                    y_col = st.selectbox("Y-axis", numeric_cols)
+                    fig = px.bar(df, x=x_col, y=y_col, title=f"{y_col} by {x_col}")
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                elif viz_type == "Line Chart":
+                    x_col = st.selectbox("X-axis", df.columns.tolist())
+                    y_col = st.selectbox("Y-axis", numeric_cols)
+                    fig = px.line(df, x=x_col, y=y_col, title=f"{y_col} trend")
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                elif viz_type == "Pie Chart" and len(df) <= 10:
+                    label_col = st.selectbox("Labels", df.columns.tolist())
+                    value_col = st.selectbox("Values", numeric_cols)
+                    fig = px.pie(df, names=label_col, values=value_col, title=f"{value_col} distribution")
+                    st.plotly_chart(fig, use_container_width=True)
 
 # ==================== TAB 2: AI Chatbot ====================
 with tab2:
@@ -273,122 +583,33 @@ with tab2:
         ask_button = st.button("🚀 Ask", type="primary", use_container_width=True)
     with col2:
         if st.button("🗑️ Clear Chat History", use_container_width=True):
+            # Remove any results spilled to disk before dropping the history
+            shutil.rmtree(st.session_state.chat_cache_dir, ignore_errors=True)
             st.session_state.chat_history = []
+            st.session_state.pending_query = None
             st.rerun()
     
     # Process question
-    if ask_button and user_question.strip():
+    if ask_button and user_question.strip() and st.session_state.pending_query is None:
         # Check if API key is set
-        settings = get_settings()
-        if not settings.openai_api_key or settings.openai_api_key == "your_openai_api_key_here":
+        if not _HAS_KEY:
             st.error("❌ Please set your OPENAI_API_KEY in the .env file to use the AI chatbot.")
         else:
             # Add to chat history
-            st.session_state.chat_history.append({"role": "user", "content": user_question})
+            append_chat_message({"role": "user", "content": user_question})
             
-            # Show processing
-            with st.spinner("🤔 Thinking..."):
-                # Initialize state
-                initial_state = {
-                    "question": user_question,
-                    "relevant_tables": [],
-                    "schema_context": "",
-                    "selected_examples": [],
-                    "generated_sql": "",
-                    "reasoning": "",
-                    "is_valid_syntax": False,
-                    "is_valid_semantics": False,
-                    "validation_errors": [],
-                    "correction_attempt": 0,
-                    "correction_history": [],
-                    "execution_successful": False,
-                    "execution_error": None,
-                    "query_results": None,
-                    "final_sql": "",
-                    "final_answer": ""
-                }
-                
-                try:
-                    # Run workflow
-                    final_state = text_to_sql_workflow.invoke(initial_state)
-                    
-                    # Extract results
-                    generated_sql = final_state.get("final_sql", final_state.get("generated_sql", "N/A"))
-                    execution_successful = final_state.get("execution_successful", False)
-                    query_results = final_state.get("query_results", [])
-                    execution_error = final_state.get("execution_error")
-                    correction_attempts = final_state.get("correction_attempt", 0)
-                    
-                    # Create response
-                    response = {
-                        "role": "assistant",
-                        "sql": generated_sql,
-                        "success": execution_successful,
-                        "results": query_results,
-                        "error": execution_error,
-                        "corrections": correction_attempts
-                    }
-                    
-                    st.session_state.chat_history.append(response)
-                    
-                except Exception as e:
-                    st.session_state.chat_history.append({
-                        "role": "assistant",
-                        "error": str(e),
-                        "success": False
-                    })
+            # Initialize state
+            initial_state = {**INITIAL_STATE, "question": user_question}
             
+            # Run workflow in the background; later reruns poll for the result
+            st.session_state.pending_query = asyncio.run_coroutine_threadsafe(
+                text_to_sql_workflow.ainvoke(initial_state), get_workflow_loop()
+            )
             st.rerun()
     
-    # Display chat history
-    if st.session_state.chat_history:
-        st.markdown("### 💬 Conversation")
-        
-        for i, message in enumerate(st.session_state.chat_history):
-            if message["role"] == "user":
-                st.markdown(f'<div class="info-box">👤 <b>You:</b> {message["content"]}</div>', unsafe_allow_html=True)
-            
-            else:  # assistant
-                st.markdown('<div class="sql-box">', unsafe_allow_html=True)
-                st.markdown("🤖 **AI Assistant**")
-                
-                if message.get("success"):
-                    # Show SQL
-                    st.markdown("**Generated SQL:**")
-                    st.code(message["sql"], language="sql")
-                    
-                    if message.get("corrections", 0) > 0:
-                        st.info(f"ℹ️ Query was corrected {message['corrections']} time(s)")
-                    
-                    # Show results
-                    results = message["results"]
-                    if results:
-                        st.success(f"✅ Success! ({len(results)} rows)")
-                        
-                        df = pd.DataFrame(results)
-                        st.dataframe(df, use_container_width=True)
-                        
-                        # Download option
-                        csv = df.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download",
-                            data=csv,
-                            file_name=f"results_{i}.csv",
-                            mime="text/csv",
-                            key=f"download_{i}"
-                        )
-                    else:
-                        st.warning("No results found.")
-                
-                else:
-                    st.error(f"❌ Error: {message.get('error', 'Unknown error occurred')}")
-                    if message.get("sql"):
-                        st.markdown("**Attempted SQL:**")
-                        st.code(message["sql"], language="sql")
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            st.markdown("---")
+    # Poll for the background workflow by rerunning only the chat panel
+    polling = st.session_state.pending_query is not None
+    st.fragment(run_every=CHAT_POLL_SECONDS if polling else None)(chat_panel)()
 
 # Footer
 st.markdown("---")
@@ -1,12 +1,18 @@
 """Main CLI application for NLP-to-SQL chatbot."""
 
+import asyncio
+import io
 import sys
 from typing import Optional
 from src.workflow.graph import text_to_sql_workflow
+from src.agents.state import INITIAL_STATE
 from src.config import get_settings
 from src.schema.schema_extractor import SchemaExtractor
 import json
 
+# One loop for the whole session so the async LLM client's connections are reused
+_EVENT_LOOP = asyncio.new_event_loop()
+
 
 def format_results(results: list) -> str:
     """Format query results for display."""
@@ -16,27 +22,36 @@ def format_results(results: list) -> str:
     # Get column names from first result
     columns = list(results[0].keys())
     
-    # Calculate column widths
-    col_widths = {}
-    for col in columns:
-        col_widths[col] = max(
-            len(str(col)),
-            max(len(str(row.get(col, ""))) for row in results)
-        )
+    # Stringify every cell once, column-major (one row.get() per cell)
+    columns_data = [[str(row.get(col, "")) for row in results] for col in columns]
+    
+    # Calculate column widths (max(map(len, ...)) runs in C)
+    col_widths = [
+        max(len(str(col)), max(map(len, values)))
+        for col, values in zip(columns, columns_data)
+    ]
     
     # Create header
-    header = " | ".join(str(col).ljust(col_widths[col]) for col in columns)
-    separator = "-+-".join("-" * col_widths[col] for col in columns)
+    header = " | ".join(str(col).ljust(width) for col, width in zip(columns, col_widths))
+    separator = "-+-".join("-" * width for width in col_widths)
     
-    # Create rows
-    rows = []
-    for row in results:
-        rows.append(" | ".join(
-            str(row.get(col, "")).ljust(col_widths[col])
-            for col in columns
-        ))
+    # Create rows by zipping the padded columns back together
+    padded = [
+        [value.ljust(width) for value in values]
+        for values, width in zip(columns_data, col_widths)
+    ]
+    rows = map(" | ".join, zip(*padded))
     
-    return "\n".join([header, separator] + rows)
+    # Assemble the table in one buffer so callers emit it with a single write
+    buf = io.StringIO()
+    buf.write(header)
+    buf.write("\n")
+    buf.write(separator)
+    for row in rows:
+        buf.write("\n")
+        buf.write(row)
+    
+    return buf.getvalue()
 
 
 def show_schema_info():
@@ -65,35 +80,18 @@ def run_query(question: str, verbose: bool = False) -> Optional[dict]:
     print(f"\n📝 Question: {question}\n")
     
     # Initialize state
-    initial_state = {
-        "question": question,
-        "relevant_tables": [],
-        "schema_context": "",
-        "selected_examples": [],
-        "generated_sql": "",
-        "reasoning": "",
-        "is_valid_syntax": False,
-        "is_valid_semantics": False,
-        "validation_errors": [],
-        "correction_attempt": 0,
-        "correction_history": [],
-        "execution_successful": False,
-        "execution_error": None,
-        "query_results": None,
-        "final_sql": "",
-        "final_answer": ""
-    }
+    initial_state = {**INITIAL_STATE, "question": question}
     
     try:
         # Run the workflow
         if verbose:
             print("🔄 Running workflow...\n")
         
-        final_state = text_to_sql_workflow.invoke(initial_state)
+        final_state = _EVENT_LOOP.run_until_complete(text_to_sql_workflow.ainvoke(initial_state))
         
         # Display results
         if verbose:
-            print(f"🔗 Relevant Tables: {', '.join(final_state.get('relevant_tables', []))}")
+            print(f"🔗 Relevant Tables: {', '.join(final_state.get('relevant_tables') or [])}")
             print(f"🔄 Correction Attempts: {final_state.get('correction_attempt', 0)}")
         
         print(f"\n💾 Generated SQL:")
@@ -101,12 +99,11 @@ def run_query(question: str, verbose: bool = False) -> Optional[dict]:
         
         if final_state.get("execution_successful"):
             results = final_state.get("query_results", [])
-            print(f"✅ Query executed successfully! ({len(results)} row(s) returned)\n")
-            
-            if results:
-                print(format_results(results))
-            else:
-                print("No results found.")
+            # format_results() covers the empty case; emit the whole block at once
+            sys.stdout.write(
+                f"✅ Query executed successfully! ({len(results)} row(s) returned)\n\n"
+                f"{format_results(results)}\n"
+            )
         else:
             error = final_state.get("execution_error", "Unknown error")
             print(f"❌ Query execution failed: {error}")
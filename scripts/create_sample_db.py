@@ -7,6 +7,7 @@ import sqlite3
 import os
 from datetime import datetime, timedelta
 import random
+import numpy as np
 
 # Sample data
 FIRST_NAMES = ["John", "Jane", "Bob", "Alice", "Charlie", "Emma", "David", "Sarah", "Michael", "Lisa"]
@@ -24,6 +25,24 @@ PRODUCTS = {
     "Toys": ["Board Game", "Puzzle", "Action Figure", "Doll", "Building Blocks", "RC Car"]
 }
 
+# SQLite's default limit on bound parameters per statement
+MAX_SQL_PARAMS = 999
+
+def bulk_insert(cursor, table: str, columns: list, rows: list):
+    """Insert rows with multi-row VALUES statements, chunked under the parameter limit."""
+    if not rows:
+        return
+    
+    rows_per_stmt = MAX_SQL_PARAMS // len(columns)
+    row_placeholder = "(" + ", ".join("?" * len(columns)) + ")"
+    column_list = ", ".join(columns)
+    
+    for start in range(0, len(rows), rows_per_stmt):
+        chunk = rows[start:start + rows_per_stmt]
+        placeholders = ", ".join([row_placeholder] * len(chunk))
+        params = [value for row in chunk for value in row]
+        cursor.execute(f"INSERT INTO {table} ({column_list}) VALUES {placeholders}", params)
+
 def create_database():
     """Create and populate the sample database."""
     
@@ -40,6 +59,9 @@ def create_database():
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
+    # Bulk-load settings: the file is rebuilt from scratch, so durability is not needed
+    conn.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF; PRAGMA locking_mode=EXCLUSIVE;")
+    
     # Create tables
     print("Creating tables...")
     
@@ -94,9 +116,12 @@ def create_database():
         )
     """)
     
+    # Populate everything in a single transaction
+    cursor.execute("BEGIN")
+    
     print("Populating customers...")
     # Insert customers
-    customers = []
+    customer_rows = []
     for i in range(50):
         first_name = random.choice(FIRST_NAMES)
         last_name = random.choice(LAST_NAMES)
@@ -106,66 +131,95 @@ def create_database():
         city = CITIES[city_idx]
         state = STATES[city_idx]
         reg_date = (datetime.now() - timedelta(days=random.randint(30, 730))).strftime("%Y-%m-%d")
-        
-        cursor.execute("""
-            INSERT INTO customers (first_name, last_name, email, phone, city, state, registration_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (first_name, last_name, email, phone, city, state, reg_date))
-        customers.append(cursor.lastrowid)
+        customer_rows.append((first_name, last_name, email, phone, city, state, reg_date))
+    
+    bulk_insert(
+        cursor, "customers",
+        ["first_name", "last_name", "email", "phone", "city", "state", "registration_date"],
+        customer_rows
+    )
+    
+    # The tables were just created, so AUTOINCREMENT ids are 1..N in insertion order
+    customers = list(range(1, len(customer_rows) + 1))
     
     print("Populating products...")
     # Insert products
-    products = []
+    product_rows = []
     for category, product_list in PRODUCTS.items():
         for product_name in product_list:
             price = round(random.uniform(9.99, 999.99), 2)
             stock = random.randint(0, 200)
             description = f"High-quality {product_name.lower()} from the {category} category"
-            
-            cursor.execute("""
-                INSERT INTO products (product_name, category, price, stock_quantity, description)
-                VALUES (?, ?, ?, ?, ?)
-            """, (product_name, category, price, stock, description))
-            products.append(cursor.lastrowid)
+            product_rows.append((product_name, category, price, stock, description))
+    
+    bulk_insert(
+        cursor, "products",
+        ["product_name", "category", "price", "stock_quantity", "description"],
+        product_rows
+    )
+    
+    # Keep prices in memory so order items never query the products table
+    product_prices = {
+        product_id: row[2]
+        for product_id, row in enumerate(product_rows, start=1)
+    }
+    products = list(product_prices)
     
     print("Populating orders and order items...")
-    # Insert orders and order items
+    # Insert orders and order items, drawing all random values as NumPy arrays
     statuses = ["Pending", "Completed", "Shipped", "Delivered", "Cancelled"]
-    
-    for i in range(100):
-        customer_id = random.choice(customers)
-        order_date = (datetime.now() - timedelta(days=random.randint(1, 365))).strftime("%Y-%m-%d")
-        status = random.choice(statuses)
-        
-        # Create order with placeholder total
-        cursor.execute("""
-            INSERT INTO orders (customer_id, order_date, status, total_amount)
-            VALUES (?, ?, ?, ?)
-        """, (customer_id, order_date, status, 0.0))
-        order_id = cursor.lastrowid
-        
-        # Add 1-5 items to the order
-        num_items = random.randint(1, 5)
-        total_amount = 0.0
-        
-        selected_products = random.sample(products, min(num_items, len(products)))
-        for product_id in selected_products:
-            # Get product price
-            cursor.execute("SELECT price FROM products WHERE product_id = ?", (product_id,))
-            unit_price = cursor.fetchone()[0]
-            
-            quantity = random.randint(1, 3)
-            total_amount += unit_price * quantity
-            
-            cursor.execute("""
-                INSERT INTO order_items (order_id, product_id, quantity, unit_price)
-                VALUES (?, ?, ?, ?)
-            """, (order_id, product_id, quantity, unit_price))
-        
-        # Update order total
-        cursor.execute("""
-            UPDATE orders SET total_amount = ? WHERE order_id = ?
-        """, (round(total_amount, 2), order_id))
+    num_orders = 100
+    max_items = 5
+    rng = np.random.default_rng()
+    
+    order_ids = np.arange(1, num_orders + 1)
+    order_customers = rng.choice(customers, size=num_orders)
+    order_days = rng.integers(1, 366, size=num_orders)
+    order_statuses = rng.choice(statuses, size=num_orders)
+    
+    # Add 1-5 distinct products to each order: the first k entries of a per-order permutation
+    items_per_order = rng.integers(1, max_items + 1, size=num_orders)
+    permutations = rng.permuted(np.tile(np.arange(len(products)), (num_orders, 1)), axis=1)
+    item_slots = np.arange(min(max_items, len(products)))
+    product_idx = permutations[:, item_slots][item_slots < items_per_order[:, None]]
+    
+    # Row-major masking above keeps items grouped by order, matching np.repeat
+    item_order_ids = np.repeat(order_ids, items_per_order)
+    item_product_ids = np.asarray(products)[product_idx]
+    item_quantities = rng.integers(1, 4, size=len(product_idx))
+    item_prices = np.asarray([product_prices[pid] for pid in products])[product_idx]
+    
+    # Totals are known up front, so no follow-up UPDATE is needed
+    order_totals = np.bincount(
+        item_order_ids,
+        weights=item_prices * item_quantities,
+        minlength=num_orders + 1
+    )[1:].round(2)
+    
+    now = datetime.now()
+    order_rows = [
+        (customer_id, (now - timedelta(days=days)).strftime("%Y-%m-%d"), status, total)
+        for customer_id, days, status, total in zip(
+            order_customers.tolist(), order_days.tolist(),
+            order_statuses.tolist(), order_totals.tolist()
+        )
+    ]
+    order_item_rows = list(zip(
+        item_order_ids.tolist(), item_product_ids.tolist(),
+        item_quantities.tolist(), item_prices.tolist()
+    ))
+    
+    bulk_insert(
+        cursor, "orders",
+        ["customer_id", "order_date", "status", "total_amount"],
+        order_rows
+    )
+    
+    bulk_insert(
+        cursor, "order_items",
+        ["order_id", "product_id", "quantity", "unit_price"],
+        order_item_rows
+    )
     
     # Commit and close
     conn.commit()
@@ -0,0 +1,24 @@
+"""Shared cleanup for SQL returned by the LLM."""
+
+import re
+
+
+# Leading ```/```sql fence or trailing ``` fence
+_FENCE = re.compile(r'^\s*```(?:sql)?\s*|\s*```\s*$', re.I)
+_LEADING_FENCE = re.compile(r'^\s*```(?:sql)?\s*', re.I)
+
+
+def strip_sql(sql: str) -> str:
+    """Remove markdown code fences and trailing semicolons from LLM output."""
+    return _FENCE.sub('', sql).strip().rstrip(';')
+
+
+def strip_leading_fence(head: str) -> str:
+    """Remove an opening code fence from the start of a partial LLM response."""
+    return _LEADING_FENCE.sub('', head, count=1)
+
+
+def fence_head_complete(head: str) -> bool:
+    """Whether enough of a streamed response has arrived to strip its opening fence."""
+    head = head.lstrip()
+    return not head.startswith('`') or '\n' in head or len(head) > len('```sql ')
@@ -1,9 +1,11 @@
 """SQL query executor."""
 
+from functools import lru_cache
 from typing import Dict, List
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from ..agents.state import SQLState
-from ..config import get_settings
+from ..agents.sql_cache import get_sql_cache
+from ..db import get_engine
 
 
 class SQLExecutor:
@@ -11,10 +13,7 @@ class SQLExecutor:
     
     def __init__(self, database_url: str = None):
         """Initialize executor."""
-        if database_url is None:
-            settings = get_settings()
-            database_url = settings.database_url
-        self.engine = create_engine(database_url)
+        self.engine = get_engine(database_url)
     
     def execute(self, state: SQLState) -> Dict:
         """
@@ -26,28 +25,17 @@ class SQLExecutor:
         Returns:
             Updated state with execution results
         """
-        sql = state["generated_sql"]
+        sql = state.generated_sql
         
         try:
             with self.engine.connect() as conn:
-                result = conn.execute(text(sql))
+                # Stream rows so they aren't buffered in both the driver and Python
+                result = conn.execution_options(stream_results=True).execute(text(sql))
                 
-                # Fetch results
-                columns = result.keys()
-                rows = result.fetchall()
-                
-                # Convert to list of dictionaries
-                query_results = [
-                    dict(zip(columns, row))
-                    for row in rows
-                ]
-                
-                return {
-                    "execution_successful": True,
-                    "execution_error": None,
-                    "query_results": query_results,
-                    "final_sql": sql
-                }
+                # Convert to list of dictionaries straight from the row mappings
+                query_results = []
+                for partition in result.mappings().partitions(1000):
+                    query_results.extend(map(dict, partition))
         
         except Exception as e:
             return {
@@ -55,9 +43,31 @@ class SQLExecutor:
                 "execution_error": str(e),
                 "query_results": None
             }
+        
+        # Only SQL that actually ran is reused for later questions
+        if state.cache_key:
+            get_sql_cache().put(
+                state.cache_key,
+                sql,
+                state.schema_hash,
+                state.question,
+                state.question_embedding
+            )
+        
+        return {
+            "execution_successful": True,
+            "execution_error": None,
+            "query_results": query_results,
+            "final_sql": sql
+        }
+
+
+@lru_cache(maxsize=1)
+def _get_executor() -> SQLExecutor:
+    """Get the shared executor so its engine and connection pool are reused."""
+    return SQLExecutor()
 
 
 def executor_node(state: SQLState) -> Dict:
     """LangGraph node for SQL execution."""
-    executor = SQLExecutor()
-    return executor.execute(state)
+    return _get_executor().execute(state)
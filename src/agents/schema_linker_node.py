@@ -1,12 +1,46 @@
 """Schema linking node for the workflow."""
 
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
+from langchain_openai import OpenAIEmbeddings
 from ..schema.schema_extractor import SchemaExtractor
 from ..schema.schema_linker import SchemaLinker
 from ..agents.state import SQLState
+from ..agents.sql_cache import content_hash
 from ..config import get_settings
 
 
+@lru_cache(maxsize=1)
+def _get_linker() -> SchemaLinker:
+    """Get the shared schema linker; schema introspection is deterministic per database."""
+    settings = get_settings()
+    
+    # Initialize schema tools (disable Phase 1 LLM descriptions for clean Phase 2 test)
+    extractor = SchemaExtractor(settings.database_url, use_llm_descriptions=False)
+    
+    embeddings = None
+    if settings.semantic_schema_linking:
+        embeddings = OpenAIEmbeddings(
+            model=settings.embedding_model,
+            api_key=settings.openai_api_key
+        )
+    return SchemaLinker(extractor, embeddings)
+
+
+@lru_cache(maxsize=256)
+def _link(question: str) -> Tuple[Tuple[str, ...], str, str]:
+    """Rank tables and render their schema once per distinct question."""
+    # Find relevant tables (top 3) and their schema in one pass
+    linker = _get_linker()
+    ranked, schema_context = linker.link_and_render(question, top_k=3)
+    tables = tuple(table for table, score in ranked)
+    
+    # Hash the tables' DDL in a fixed order, not the rendered context with its per-question
+    # relevance scores, so paraphrases linking the same tables share cached SQL
+    schema_hash = content_hash("\n\n".join(linker.schema_extractor.get_tables_schema(sorted(tables))))
+    return tables, schema_context, schema_hash
+
+
 def schema_linker_node(state: SQLState) -> Dict:
     """
     Link question to relevant database tables and provide schema context.
@@ -17,20 +51,10 @@ def schema_linker_node(state: SQLState) -> Dict:
     Returns:
         Updated state with relevant schema information
     """
-    settings = get_settings()
-    
-    # Initialize schema tools (disable Phase 1 LLM descriptions for clean Phase 2 test)
-    extractor = SchemaExtractor(settings.database_url, use_llm_descriptions=False)
-    linker = SchemaLinker(extractor)
-    
-    # Find relevant tables (top 3)
-    relevant_tables_with_scores = linker.link_tables(state["question"], top_k=3)
-    relevant_tables = [table for table, score in relevant_tables_with_scores]
-    
-    # Get schema for relevant tables only
-    schema_context = linker.get_relevant_schema(state["question"], top_k=3)
+    relevant_tables, schema_context, schema_hash = _link(state.question)
     
     return {
-        "relevant_tables": relevant_tables,
-        "schema_context": schema_context
+        "relevant_tables": list(relevant_tables),
+        "schema_context": schema_context,
+        "schema_hash": schema_hash
     }
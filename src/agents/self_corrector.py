@@ -1,10 +1,12 @@
 """Self-correction agent for fixing SQL errors."""
 
+from functools import lru_cache
 from typing import Dict
 from langchain_openai import ChatOpenAI
 from ..config import get_settings
 from ..prompts.templates import create_correction_prompt
 from ..agents.state import SQLState
+from ..agents._sql_clean import strip_sql
 
 
 class SelfCorrector:
@@ -21,7 +23,7 @@ class SelfCorrector:
         )
         self.max_attempts = settings.max_correction_attempts
     
-    def correct(self, state: SQLState) -> Dict:
+    async def correct(self, state: SQLState) -> Dict:
         """
         Attempt to correct an invalid SQL query.
         
@@ -32,8 +34,8 @@ class SelfCorrector:
             Updated state with corrected SQL
         """
         # Get error information
-        validation_errors = state.get("validation_errors", [])
-        execution_error = state.get("execution_error")
+        validation_errors = state.validation_errors
+        execution_error = state.execution_error
         
         # Determine error type and message
         if validation_errors:
@@ -48,39 +50,32 @@ class SelfCorrector:
         
         # Create correction prompt
         prompt = create_correction_prompt(
-            question=state["question"],
-            schema=state["schema_context"],
-            incorrect_sql=state["generated_sql"],
+            question=state.question,
+            schema=state.schema_context,
+            incorrect_sql=state.generated_sql,
             error_message=error_message,
             error_type=error_type
         )
         
         # Generate corrected SQL
-        response = self.llm.invoke(prompt)
-        corrected_sql = response.content.strip()
-        
-        # Clean up the SQL
-        if corrected_sql.startswith("```sql"):
-            corrected_sql = corrected_sql.replace("```sql", "").replace("```", "").strip()
-        elif corrected_sql.startswith("```"):
-            corrected_sql = corrected_sql.replace("```", "").strip()
-        
-        corrected_sql = corrected_sql.rstrip(';')
-        
-        # Update correction history
-        correction_history = state.get("correction_history", [])
-        correction_history.append(state["generated_sql"])
+        response = await self.llm.ainvoke(prompt)
+        corrected_sql = strip_sql(response.content)
         
         return {
             "generated_sql": corrected_sql,
-            "correction_attempt": state.get("correction_attempt", 0) + 1,
-            "correction_history": correction_history,
+            "correction_attempt": state.correction_attempt + 1,
+            "correction_history": [state.generated_sql],  # Appended by the state reducer
             "validation_errors": [],  # Reset errors for new attempt
             "execution_error": None
         }
 
 
-def corrector_node(state: SQLState) -> Dict:
+@lru_cache(maxsize=1)
+def _get_corrector() -> SelfCorrector:
+    """Get the shared corrector so its LLM client and connection pool are reused."""
+    return SelfCorrector()
+
+
+async def corrector_node(state: SQLState) -> Dict:
     """LangGraph node for self-correction."""
-    corrector = SelfCorrector()
-    return corrector.correct(state)
+    return await _get_corrector().correct(state)
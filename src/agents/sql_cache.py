@@ -0,0 +1,237 @@
+"""Exact and semantic cache for LLM-produced SQL."""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+from ..config import get_settings
+
+
+# Persistent cache location
+CACHE_PATH = Path(".sql_cache") / "sql_cache.db"
+
+# Initial number of embedding rows allocated; the matrix doubles when full
+INITIAL_CAPACITY = 64
+
+# Numbers and quoted strings in a question; a semantic hit must agree on all of them
+_LITERAL_RE = re.compile(r"'[^']*'|\"[^\"]*\"|\d+(?:\.\d+)?")
+
+
+def content_hash(text: str) -> str:
+    """Short stable hash used for cache keys."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def prompt_hash(messages: List[Dict[str, str]]) -> str:
+    """Hash of a chat-message prompt, covering roles and contents."""
+    return content_hash("\n".join(f"{m['role']}: {m['content']}" for m in messages))
+
+
+def question_literals(question: str) -> str:
+    """Canonical form of the numeric and quoted literals in a question."""
+    return "\x1f".join(sorted(_LITERAL_RE.findall(question)))
+
+
+class SQLCache:
+    """Two-tier SQL cache: exact prompt match, then question-embedding similarity."""
+    
+    def __init__(self, path: Optional[Path] = None, max_entries: Optional[int] = None):
+        """
+        Initialize the cache and load persisted entries.
+        
+        Args:
+            path: SQLite file used to share entries across processes (defaults to CACHE_PATH)
+            max_entries: Entries kept before the least recently used are evicted
+                (defaults to the sql_cache_max_entries setting)
+        """
+        settings = get_settings()
+        self.embeddings = OpenAIEmbeddings(
+            model=settings.embedding_model,
+            api_key=settings.openai_api_key
+        )
+        self.similarity_threshold = settings.sql_cache_similarity
+        self.max_entries = max_entries or settings.sql_cache_max_entries
+        
+        self._lock = threading.Lock()
+        
+        # Exact tier in least-recently-used order: key -> sql
+        self._exact = OrderedDict()
+        
+        # Semantic tier: preallocated unit-vector rows, the (key, schema_hash, literals, sql) stored in
+        # each row (None for free rows), and the row of each key
+        self._matrix = None
+        self._entries = []
+        self._rows = {}
+        self._free_rows = []
+        
+        path = path or CACHE_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sql_cache ("
+            "key TEXT PRIMARY KEY, schema_hash TEXT, sql TEXT, embedding BLOB, last_used REAL DEFAULT 0, literals TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sql_cache)")}
+        if "last_used" not in columns:
+            self._conn.execute("ALTER TABLE sql_cache ADD COLUMN last_used REAL DEFAULT 0")
+        if "literals" not in columns:
+            # Older entries have no recorded literals and are only reused on an exact match
+            self._conn.execute("ALTER TABLE sql_cache ADD COLUMN literals TEXT")
+        self._load()
+    
+    def _load(self):
+        """Load the most recently used persisted entries into memory."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, schema_hash, sql, embedding, literals FROM sql_cache ORDER BY last_used"
+            ).fetchall()
+            for key, schema_hash, sql, embedding, literals in rows[-self.max_entries:]:
+                vector = np.frombuffer(embedding, dtype=np.float32) if embedding is not None else None
+                self._insert(key, sql, schema_hash, vector, literals)
+            
+            # Drop whatever no longer fits
+            stale = [(row[0],) for row in rows[:-self.max_entries]]
+            if stale:
+                self._conn.executemany("DELETE FROM sql_cache WHERE key = ?", stale)
+                self._conn.commit()
+    
+    def _touch(self, key: str):
+        """Mark an entry as recently used, in memory and on disk (lock held)."""
+        self._exact.move_to_end(key)
+        self._conn.execute("UPDATE sql_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+    
+    def _insert(
+        self,
+        key: str,
+        sql: str,
+        schema_hash: str,
+        embedding: Optional[np.ndarray],
+        literals: Optional[str]
+    ) -> List[str]:
+        """Add or replace an in-memory entry and return the keys evicted to make room (lock held)."""
+        self._remove(key)
+        self._exact[key] = sql
+        
+        # Skip vectors left behind by a different embedding model
+        if embedding is not None and (self._matrix is None or self._matrix.shape[1] == embedding.shape[0]):
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = len(self._entries)
+                self._entries.append(None)
+                if self._matrix is None:
+                    self._matrix = np.zeros((INITIAL_CAPACITY, embedding.shape[0]), dtype=np.float32)
+                elif row == self._matrix.shape[0]:
+                    # Grow geometrically so inserts stay amortized O(1)
+                    grown = np.zeros((2 * row, self._matrix.shape[1]), dtype=np.float32)
+                    grown[:row] = self._matrix
+                    self._matrix = grown
+            self._matrix[row] = embedding
+            self._entries[row] = (key, schema_hash, literals, sql)
+            self._rows[key] = row
+        
+        evicted = []
+        while len(self._exact) > self.max_entries:
+            oldest = next(iter(self._exact))
+            self._remove(oldest)
+            evicted.append(oldest)
+        return evicted
+    
+    def _remove(self, key: str):
+        """Drop an in-memory entry and free its embedding row (lock held)."""
+        self._exact.pop(key, None)
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._matrix[row] = 0
+            self._entries[row] = None
+            self._free_rows.append(row)
+    
+    def get(self, key: str) -> Optional[str]:
+        """Exact-match lookup."""
+        with self._lock:
+            sql = self._exact.get(key)
+            if sql is not None:
+                self._touch(key)
+            return sql
+    
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed text as a unit vector, or None if the embedding call fails."""
+        try:
+            vector = np.asarray(await self.embeddings.aembed_query(text), dtype=np.float32)
+        except Exception:
+            return None
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    def get_similar(self, embedding: Optional[np.ndarray], schema_hash: str, question: str) -> Optional[str]:
+        """
+        Return cached SQL for a near-identical question against the same schema.
+        
+        Args:
+            embedding: Unit-vector embedding of the question
+            schema_hash: Hash of the schema context the SQL must have been written against
+            question: The question itself; cached SQL is only reused when its question had the
+                same numbers and quoted values ("orders in 2024" never answers "orders in 2025")
+        """
+        if embedding is None:
+            return None
+        
+        literals = question_literals(question)
+        
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != embedding.shape[0]:
+                return None
+            
+            # Cosine similarity against every cached question in one product (free rows score 0)
+            scores = self._matrix[:len(self._entries)] @ embedding
+            for i in np.argsort(scores)[::-1]:
+                if scores[i] < self.similarity_threshold:
+                    break
+                entry = self._entries[i]
+                if entry is not None and entry[1] == schema_hash and entry[2] == literals:
+                    self._touch(entry[0])
+                    return entry[3]
+        
+        return None
+    
+    def put(
+        self,
+        key: str,
+        sql: str,
+        schema_hash: str,
+        question: str,
+        embedding: Optional[np.ndarray] = None
+    ):
+        """Store SQL under an exact key and, when given, its question embedding."""
+        if embedding is not None:
+            embedding = np.asarray(embedding, dtype=np.float32)
+        literals = question_literals(question)
+        
+        with self._lock:
+            evicted = self._insert(key, sql, schema_hash, embedding, literals)
+            
+            blob = embedding.tobytes() if embedding is not None else None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sql_cache (key, schema_hash, sql, embedding, last_used, literals) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, schema_hash, sql, blob, time.time(), literals)
+            )
+            if evicted:
+                self._conn.executemany("DELETE FROM sql_cache WHERE key = ?", [(k,) for k in evicted])
+            self._conn.commit()
+
+
+@lru_cache(maxsize=1)
+def get_sql_cache() -> SQLCache:
+    """Get the process-wide SQL cache."""
+    return SQLCache()
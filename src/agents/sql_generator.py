@@ -1,10 +1,13 @@
 """SQL Generator agent using OpenAI LLM."""
 
+from functools import lru_cache
 from typing import Dict
 from langchain_openai import ChatOpenAI
 from ..config import get_settings
 from ..prompts.templates import create_sql_generation_prompt
 from ..agents.state import SQLState
+from ..agents.sql_cache import get_sql_cache, prompt_hash
+from ..agents._sql_clean import fence_head_complete, strip_leading_fence, strip_sql
 
 
 class SQLGenerator:
@@ -19,8 +22,9 @@ class SQLGenerator:
             max_tokens=settings.llm_max_tokens,
             api_key=settings.openai_api_key
         )
+        self.cache = get_sql_cache()
     
-    def generate(self, state: SQLState) -> Dict:
+    async def generate(self, state: SQLState) -> Dict:
         """
         Generate SQL query from natural language question.
         
@@ -30,34 +34,72 @@ class SQLGenerator:
         Returns:
             Updated state with generated SQL
         """
-        # Create prompt with schema and examples
+        # Create messages: stable system prefix (rules + schema), question-specific user turn
         prompt = create_sql_generation_prompt(
-            question=state["question"],
-            schema=state["schema_context"],
-            examples=state.get("selected_examples", [])
+            question=state.question,
+            schema=state.schema_context,
+            examples=state.selected_examples
         )
         
-        # Generate SQL
-        response = self.llm.invoke(prompt)
-        generated_sql = response.content.strip()
+        # Exact hit on the full prompt skips the LLM entirely
+        key = prompt_hash(prompt)
+        cached_sql = self.cache.get(key)
+        if cached_sql is not None:
+            return {
+                "generated_sql": cached_sql,
+                "reasoning": "Reused cached SQL for identical question",
+                "correction_attempt": state.correction_attempt
+            }
         
-        # Clean up the SQL (remove markdown formatting if present)
-        if generated_sql.startswith("```sql"):
-            generated_sql = generated_sql.replace("```sql", "").replace("```", "").strip()
-        elif generated_sql.startswith("```"):
-            generated_sql = generated_sql.replace("```", "").strip()
+        # Otherwise look for a near-identical question against the same schema
+        embedding = await self.cache.embed(state.question)
+        cached_sql = self.cache.get_similar(embedding, state.schema_hash, state.question)
+        if cached_sql is not None:
+            return {
+                "generated_sql": cached_sql,
+                "reasoning": "Reused cached SQL for similar question",
+                "correction_attempt": state.correction_attempt,
+                "cache_key": key
+            }
         
-        # Remove any trailing semicolons for consistency
-        generated_sql = generated_sql.rstrip(';')
+        # Generate SQL, cleaning up while tokens are still arriving
+        generated_sql = await self._stream_sql(prompt)
         
+        # Cached by the executor only once the (possibly corrected) SQL has run successfully
         return {
             "generated_sql": generated_sql,
             "reasoning": "Generated SQL from natural language question",
-            "correction_attempt": state.get("correction_attempt", 0)
+            "correction_attempt": state.correction_attempt,
+            "cache_key": key,
+            "question_embedding": embedding
         }
+    
+    async def _stream_sql(self, prompt) -> str:
+        """
+        Stream the completion and return the cleaned SQL.
+        
+        The opening code fence is dropped as soon as it has fully arrived, so only
+        the closing fence and semicolon are left for the final cleanup.
+        """
+        parts = []
+        head_stripped = False
+        
+        async for chunk in self.llm.astream(prompt):
+            parts.append(chunk.content)
+            
+            if not head_stripped and fence_head_complete("".join(parts)):
+                parts = [strip_leading_fence("".join(parts))]
+                head_stripped = True
+        
+        return strip_sql("".join(parts))
+
+
+@lru_cache(maxsize=1)
+def _get_generator() -> SQLGenerator:
+    """Get the shared generator so its LLM client and connection pool are reused."""
+    return SQLGenerator()
 
 
-def sql_generator_node(state: SQLState) -> Dict:
+async def sql_generator_node(state: SQLState) -> Dict:
     """LangGraph node for SQL generation."""
-    generator = SQLGenerator()
-    return generator.generate(state)
+    return await _get_generator().generate(state)
@@ -1,39 +1,77 @@
 """Shared state definition for the LangGraph workflow."""
 
-from typing import List, Dict, Optional, TypedDict
+import operator
+from dataclasses import dataclass, field
+from typing import Annotated, Any, List, Dict, Optional
 
 
-class SQLState(TypedDict):
-    """State shared across all nodes in the workflow."""
+@dataclass(slots=True)
+class SQLState:
+    """
+    State shared across all nodes in the workflow.
+    
+    Nodes read fields as attributes and return dicts of updated fields.
+    """
     
     # Input
-    question: str
+    question: str = ""
     
     # Schema Linking
-    relevant_tables: List[str]
-    schema_context: str
+    relevant_tables: Optional[List[str]] = None
+    schema_context: str = ""
+    # Hash of the linked tables' DDL; identifies the schema cached SQL was written against
+    schema_hash: str = ""
     
     # Example Selection
-    selected_examples: List[Dict[str, str]]
+    selected_examples: Optional[List[Dict[str, str]]] = None
     
     # SQL Generation
-    generated_sql: str
-    reasoning: str
+    generated_sql: str = ""
+    reasoning: str = ""
+    # SQL cache entry to write once the query has executed successfully
+    cache_key: str = ""
+    question_embedding: Optional[Any] = None
     
     # Validation
-    is_valid_syntax: bool
-    is_valid_semantics: bool
-    validation_errors: List[str]
+    is_valid_syntax: bool = False
+    is_valid_semantics: bool = False
+    validation_errors: Optional[List[str]] = None
     
     # Self-Correction
-    correction_attempt: int
-    correction_history: List[str]
+    correction_attempt: int = 0
+    # Nodes return only new entries; LangGraph concatenates them
+    correction_history: Annotated[List[str], operator.add] = field(default_factory=list)
     
     # Execution
-    execution_successful: bool
-    execution_error: Optional[str]
-    query_results: Optional[List[Dict]]
+    execution_successful: bool = False
+    execution_error: Optional[str] = None
+    query_results: Optional[List[Dict]] = None
     
     # Final Output
-    final_sql: str
-    final_answer: str
+    final_sql: str = ""
+    final_answer: str = ""
+
+
+# Skeleton for a new workflow run; copy it with {**INITIAL_STATE, "question": ...}.
+# List fields start as None so no fresh lists are allocated per run; nodes treat
+# None as empty. correction_history is left out: its reducer starts it empty.
+INITIAL_STATE: Dict[str, Any] = {
+    "question": "",
+    "relevant_tables": None,
+    "schema_context": "",
+    "schema_hash": "",
+    "selected_examples": None,
+    "generated_sql": "",
+    "reasoning": "",
+    "cache_key": "",
+    "question_embedding": None,
+    "is_valid_syntax": False,
+    "is_valid_semantics": False,
+    "validation_errors": None,
+    "correction_attempt": 0,
+    "execution_successful": False,
+    "execution_error": None,
+    "query_results": None,
+    "final_sql": "",
+    "final_answer": ""
+}
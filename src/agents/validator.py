@@ -1,10 +1,17 @@
 """SQL query validator for syntax and semantic checking."""
 
-import sqlparse
+import asyncio
+import re
+from functools import lru_cache
 from typing import Dict, List, Tuple
 from ..agents.state import SQLState
-from sqlalchemy import create_engine, text
-from ..config import get_settings
+from sqlalchemy import text
+from ..db import get_engine
+
+
+# Compiled once: statement must start as a query, and may not contain write/DDL keywords
+_SELECT_START = re.compile(r'^\s*(WITH\b.*?\bSELECT\b|SELECT\b)', re.I | re.S)
+_FORBIDDEN = re.compile(r'\b(INSERT|UPDATE|DELETE|DROP|ALTER|CREATE|TRUNCATE|ATTACH|DETACH|PRAGMA)\b', re.I)
 
 
 class SQLValidator:
@@ -12,49 +19,35 @@ class SQLValidator:
     
     def __init__(self, database_url: str = None):
         """Initialize validator."""
-        if database_url is None:
-            settings = get_settings()
-            database_url = settings.database_url
-        self.engine = create_engine(database_url)
+        self.engine = get_engine(database_url)
+        
+        # Correction loops re-validate the same SQL; remember definitive EXPLAIN outcomes
+        self._explain_cached = lru_cache(maxsize=1024)(self._explain)
     
     def validate_syntax(self, sql: str) -> Tuple[bool, List[str]]:
         """
-        Validate SQL syntax using sqlparse.
+        Validate SQL syntax with precompiled regex checks.
         
         Returns:
             (is_valid, list_of_errors)
         """
-        errors = []
+        if not sql or not sql.strip():
+            return False, ["Empty or invalid SQL query"]
         
-        try:
-            # Parse the SQL
-            parsed = sqlparse.parse(sql)
-            
-            if not parsed:
-                errors.append("Empty or invalid SQL query")
-                return False, errors
-            
-            # Check for basic SQL structure
-            statement = parsed[0]
-            
-            # Check if it's a SELECT statement
-            if not statement.get_type() == 'SELECT':
-                errors.append("Only SELECT queries are allowed")
-                return False, errors
-            
-            # Check for dangerous keywords
-            sql_upper = sql.upper()
-            dangerous_keywords = ['INSERT', 'UPDATE', 'DELETE', 'DROP', 'ALTER', 'CREATE', 'TRUNCATE']
-            for keyword in dangerous_keywords:
-                if keyword in sql_upper:
-                    errors.append(f"Dangerous keyword '{keyword}' found. Only SELECT queries allowed")
-                    return False, errors
-            
-            return True, []
-            
-        except Exception as e:
-            errors.append(f"Syntax error: {str(e)}")
-            return False, errors
+        # Check if it's a SELECT statement
+        if not _SELECT_START.match(sql):
+            # Name the offending keyword when there is one
+            match = _FORBIDDEN.search(sql)
+            if match:
+                return False, [f"Dangerous keyword '{match.group(1).upper()}' found. Only SELECT queries allowed"]
+            return False, ["Only SELECT queries are allowed"]
+        
+        # Check for dangerous keywords
+        match = _FORBIDDEN.search(sql)
+        if match:
+            return False, [f"Dangerous keyword '{match.group(1).upper()}' found. Only SELECT queries allowed"]
+        
+        return True, []
     
     def validate_semantics(self, sql: str) -> Tuple[bool, List[str]]:
         """
@@ -63,34 +56,43 @@ class SQLValidator:
         Returns:
             (is_valid, list_of_errors)
         """
-        errors = []
+        try:
+            is_valid, errors = self._explain_cached(sql)
+        except Exception as e:
+            # Not remembered: a locked database or dropped connection may succeed next time
+            return False, [f"Semantic error: {str(e)}"]
+        return is_valid, list(errors)
+    
+    def _explain(self, sql: str) -> Tuple[bool, Tuple[str, ...]]:
+        """
+        Run EXPLAIN QUERY PLAN and classify schema errors (uncached).
         
+        Only outcomes that depend on the SQL alone are returned, so they are safe to
+        cache; any other error is raised.
+        """
         try:
             with self.engine.connect() as conn:
                 # Try to EXPLAIN the query (works for SQLite)
                 explain_sql = f"EXPLAIN QUERY PLAN {sql}"
                 conn.execute(text(explain_sql))
             
-            return True, []
+            return True, ()
             
         except Exception as e:
-            error_msg = str(e)
+            error_lower = str(e).lower()
             
             # Parse common errors
-            if "no such table" in error_msg.lower():
-                errors.append("Table does not exist in the database")
-            elif "no such column" in error_msg.lower():
-                errors.append("Column does not exist in the specified table")
-            elif "ambiguous column" in error_msg.lower():
-                errors.append("Ambiguous column name - specify table alias")
-            else:
-                errors.append(f"Semantic error: {error_msg}")
-            
-            return False, errors
+            if "no such table" in error_lower:
+                return False, ("Table does not exist in the database",)
+            elif "no such column" in error_lower:
+                return False, ("Column does not exist in the specified table",)
+            elif "ambiguous column" in error_lower:
+                return False, ("Ambiguous column name - specify table alias",)
+            raise
     
-    def validate(self, state: SQLState) -> Dict:
+    async def validate(self, state: SQLState) -> Dict:
         """
-        Full validation: syntax + semantics.
+        Full validation: syntax + semantics, run concurrently.
         
         Args:
             state: Current workflow state
@@ -98,11 +100,20 @@ class SQLValidator:
         Returns:
             Updated state with validation results
         """
-        sql = state["generated_sql"]
+        sql = state.generated_sql
+        
+        # Overlap the EXPLAIN round-trip with the syntax parse
+        syntax_result, semantic_result = await asyncio.gather(
+            asyncio.to_thread(self.validate_syntax, sql),
+            asyncio.to_thread(self.validate_semantics, sql),
+            return_exceptions=True
+        )
         
-        # Syntax validation
-        is_valid_syntax, syntax_errors = self.validate_syntax(sql)
+        if isinstance(syntax_result, Exception):
+            syntax_result = (False, [f"Syntax error: {str(syntax_result)}"])
+        is_valid_syntax, syntax_errors = syntax_result
         
+        # Syntax failures short-circuit; the semantic result is discarded
         if not is_valid_syntax:
             return {
                 "is_valid_syntax": False,
@@ -110,8 +121,9 @@ class SQLValidator:
                 "validation_errors": syntax_errors
             }
         
-        # Semantic validation
-        is_valid_semantics, semantic_errors = self.validate_semantics(sql)
+        if isinstance(semantic_result, Exception):
+            semantic_result = (False, [f"Semantic error: {str(semantic_result)}"])
+        is_valid_semantics, semantic_errors = semantic_result
         
         return {
             "is_valid_syntax": is_valid_syntax,
@@ -120,7 +132,12 @@ class SQLValidator:
         }
 
 
-def validator_node(state: SQLState) -> Dict:
+@lru_cache(maxsize=1)
+def _get_validator() -> SQLValidator:
+    """Get the shared validator so its engine and connection pool are reused."""
+    return SQLValidator()
+
+
+async def validator_node(state: SQLState) -> Dict:
     """LangGraph node for SQL validation."""
-    validator = SQLValidator()
-    return validator.validate(state)
+    return await _get_validator().validate(state)
@@ -20,9 +20,16 @@ class Settings(BaseSettings):
     # Example Selection
     max_examples: int = 5
     
+    # Schema Linking (rank tables by embedding similarity instead of TF-IDF)
+    semantic_schema_linking: bool = False
+    
     # Self-Correction
     max_correction_attempts: int = 3
     
+    # SQL Cache (cosine similarity needed to reuse SQL for a paraphrased question)
+    sql_cache_similarity: float = 0.97
+    sql_cache_max_entries: int = 10000
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
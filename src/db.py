@@ -0,0 +1,39 @@
+"""Shared database engine for the workflow agents."""
+
+from functools import lru_cache
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from .config import get_settings
+
+
+# Per-connection SQLite tuning: 64 MB page cache, in-memory temp tables
+SQLITE_PRAGMAS = "PRAGMA cache_size=-65536; PRAGMA temp_store=MEMORY;"
+
+
+def get_engine(database_url: str = None) -> Engine:
+    """Get the shared engine for a database URL (defaults to the configured database)."""
+    if database_url is None:
+        database_url = get_settings().database_url
+    return _create_engine(database_url)
+
+
+@lru_cache()
+def _create_engine(database_url: str) -> Engine:
+    """Create one pooled engine per database URL."""
+    # Pool sizing only applies to QueuePool; in-memory SQLite uses SingletonThreadPool, which rejects it
+    url = make_url(database_url)
+    pool_args = {}
+    if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        pool_args = {"pool_size": 8, "max_overflow": 4}
+    
+    engine = create_engine(database_url, pool_pre_ping=True, **pool_args)
+    
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_conn, _):
+            cursor = dbapi_conn.cursor()
+            cursor.executescript(SQLITE_PRAGMAS)
+            cursor.close()
+    
+    return engine
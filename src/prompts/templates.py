@@ -1,6 +1,9 @@
 """Prompt templates for SQL generation and correction."""
 
+from functools import lru_cache
+from string import Template
 from typing import List, Dict
+from .patterns import get_pattern_guidance, get_relevant_patterns
 
 
 SYSTEM_PROMPT = """You are an expert SQL query generator. Your task is to convert natural language questions into accurate SQL queries.
@@ -28,80 +31,31 @@ EXAMPLE FORMAT:
 - Sample values like "Taylor Swift", "Lady Gaga" → clearly person names"""
 
 
-def create_sql_generation_prompt(question: str, schema: str, examples: List[Dict[str, str]] = None, use_patterns: bool = True) -> str:
-    """Create prompt for SQL generation.
-    
-    Args:
-        question: Natural language question
-        schema: Database schema (DDL)
-        examples: Optional traditional examples (deprecated)
-        use_patterns: Whether to include generic pattern guidance (recommended)
-    """
-    from .patterns import get_relevant_patterns
-    
-    prompt_parts = [SYSTEM_PROMPT]
-    
-    # Add generic pattern guidance (NEW!)
-    if use_patterns:
-        patterns = get_relevant_patterns(question)
-        if patterns:
-            prompt_parts.append("\n\nSQL GENERATION PATTERNS (Follow These!):")
-            prompt_parts.append("=" * 60)
-            
-            for pattern in patterns[:4]:  # Limit to top 4 most relevant
-                prompt_parts.append(f"\n## {pattern['name']}")
-                prompt_parts.append(f"Rule: {pattern['rule']}")
-                
-                if pattern.get('examples'):
-                    for ex in pattern['examples'][:2]:  # Max 2 examples per pattern
-                        prompt_parts.append(f"  Example: \"{ex['pattern']}\"")
-                        prompt_parts.append(f"  → {ex['guidance']}")
-                        prompt_parts.append(f"  ({ex['note']})")
-    
-    # Add schema
-    prompt_parts.append("\n\nDATABASE SCHEMA:")
-    prompt_parts.append(schema)
-    
-    # Add traditional examples if provided (backward compatibility)
-    if examples:
-        prompt_parts.append("\n\nEXAMPLES:")
-        for i, example in enumerate(examples, 1):
-            prompt_parts.append(f"\nExample {i}:")
-            prompt_parts.append(f"Question: {example['question']}")
-            prompt_parts.append(f"SQL: {example['sql']}")
-    
-    # Add the actual question
-    prompt_parts.append("\n\nQUESTION TO CONVERT:")
-    prompt_parts.append(f"Question: {question}")
-    prompt_parts.append("\nSTEP-BY-STEP APPROACH:")
-    prompt_parts.append("1. Identify entities mentioned → Find matching tables")
-    prompt_parts.append("2. Identify what to return → Determine SELECT columns")
-    prompt_parts.append("3. Identify filters/conditions → Create WHERE clause")
-    prompt_parts.append("4. Check if aggregation needed → Add GROUP BY if 'each/per'")
-    prompt_parts.append("5. Apply patterns above → Follow the rules!")
-    prompt_parts.append("\nSQL:")
-    
-    return "\n".join(prompt_parts)
-
-
-def create_correction_prompt(question: str, schema: str, incorrect_sql: str, 
-                            error_message: str, error_type: str) -> str:
-    """Create prompt for SQL correction."""
-    
-    prompt = f"""{SYSTEM_PROMPT}
+# Invariant prompt text, assembled once at import. Static content goes first so
+# the provider's prompt cache can reuse it: rules, then the full pattern catalog
+# (together past OpenAI's 1024-token caching minimum), then the linked schema.
+_SYSTEM_PREFIX = SYSTEM_PROMPT + "\n\n" + get_pattern_guidance().rstrip() + "\n\nDATABASE SCHEMA:\n"
+_SYSTEM_PREFIX_NO_PATTERNS = SYSTEM_PROMPT + "\n\nDATABASE SCHEMA:\n"
 
-DATABASE SCHEMA:
-{schema}
+_GENERATION_STEPS = "\n".join([
+    "\nSTEP-BY-STEP APPROACH:",
+    "1. Identify entities mentioned → Find matching tables",
+    "2. Identify what to return → Determine SELECT columns",
+    "3. Identify filters/conditions → Create WHERE clause",
+    "4. Check if aggregation needed → Add GROUP BY if 'each/per'",
+    "5. Apply patterns above → Follow the rules!",
+    "\nSQL:"
+])
 
-TASK: Fix the following SQL query that has an error.
+_CORRECTION_TEMPLATE = Template("""TASK: Fix the following SQL query that has an error.
 
-ORIGINAL QUESTION: {question}
+ORIGINAL QUESTION: $question
 
 INCORRECT SQL:
-{incorrect_sql}
+$incorrect_sql
 
-ERROR TYPE: {error_type}
-ERROR MESSAGE: {error_message}
+ERROR TYPE: $error_type
+ERROR MESSAGE: $error_message
 
 INSTRUCTIONS:
 1. Identify the specific issue in the SQL query
@@ -109,25 +63,14 @@ INSTRUCTIONS:
 3. Ensure the corrected query answers the original question
 4. Return ONLY the corrected SQL query
 
-CORRECTED SQL:"""
-    
-    return prompt
-
-
-def create_validation_prompt(question: str, sql: str, schema: str) -> str:
-    """Create prompt for semantic validation."""
-    
-    prompt = f"""{SYSTEM_PROMPT}
-
-DATABASE SCHEMA:
-{schema}
+CORRECTED SQL:""")
 
-TASK: Validate if the following SQL query correctly answers the question.
+_VALIDATION_TEMPLATE = Template("""TASK: Validate if the following SQL query correctly answers the question.
 
-QUESTION: {question}
+QUESTION: $question
 
 SQL QUERY:
-{sql}
+$sql
 
 VALIDATION CHECKLIST:
 1. Does the query use only the columns and tables from the schema?
@@ -140,6 +83,72 @@ Respond with ONLY:
 - "VALID" if the query is correct
 - "INVALID: [brief explanation]" if there are issues
 
-RESPONSE:"""
+RESPONSE:""")
+
+
+def _system_message(schema: str, use_patterns: bool = True) -> Dict[str, str]:
+    """Static system prompt (plus pattern catalog) followed by the schema."""
+    prefix = _SYSTEM_PREFIX if use_patterns else _SYSTEM_PREFIX_NO_PATTERNS
+    return {"role": "system", "content": prefix + schema}
+
+
+@lru_cache(maxsize=1024)
+def _relevant_patterns_line(question: str) -> str:
+    """Pre-joined names of the top 4 patterns relevant to a question."""
+    patterns = get_relevant_patterns(question)[:4]
+    return f"\n\nMost relevant patterns: {', '.join(p.name for p in patterns)}"
+
+
+def create_sql_generation_prompt(question: str, schema: str, examples: List[Dict[str, str]] = None, use_patterns: bool = True) -> List[Dict[str, str]]:
+    """Create chat messages for SQL generation.
+    
+    The system message (rules, pattern catalog, schema) stays the same from question
+    to question, so only the user message varies between requests.
+    
+    Args:
+        question: Natural language question
+        schema: Database schema (DDL)
+        examples: Optional traditional examples (deprecated)
+        use_patterns: Whether to include generic pattern guidance (recommended)
+    """
+    # Add traditional examples if provided (backward compatibility), in a stable order
+    examples_block = ""
+    if examples:
+        examples_block = "EXAMPLES:" + "".join(
+            f"\n\nExample {i}:\nQuestion: {example['question']}\nSQL: {example['sql']}"
+            for i, example in enumerate(sorted(examples, key=lambda ex: (ex['question'], ex['sql'])), 1)
+        ) + "\n\n\n"
+    
+    # Point at the catalog patterns that matter for this question (after the question,
+    # so the cached prefix stays intact)
+    patterns_line = _relevant_patterns_line(question) if use_patterns else ""
+    
+    # Assemble the user message in one f-string
+    prompt = f"{examples_block}QUESTION TO CONVERT:\nQuestion: {question}{patterns_line}\n{_GENERATION_STEPS}"
+    
+    return [
+        _system_message(schema, use_patterns),
+        {"role": "user", "content": prompt}
+    ]
+
+
+def create_correction_prompt(question: str, schema: str, incorrect_sql: str, 
+                            error_message: str, error_type: str) -> List[Dict[str, str]]:
+    """Create chat messages for SQL correction."""
+    
+    prompt = _CORRECTION_TEMPLATE.substitute(
+        question=question,
+        incorrect_sql=incorrect_sql,
+        error_type=error_type,
+        error_message=error_message
+    )
+    
+    return [_system_message(schema), {"role": "user", "content": prompt}]
+
+
+def create_validation_prompt(question: str, sql: str, schema: str) -> List[Dict[str, str]]:
+    """Create chat messages for semantic validation."""
+    
+    prompt = _VALIDATION_TEMPLATE.substitute(question=question, sql=sql)
     
-    return prompt
+    return [_system_message(schema), {"role": "user", "content": prompt}]
@@ -1,11 +1,71 @@
 """Database schema extraction and management with LLM-powered descriptions."""
 
-from sqlalchemy import create_engine, inspect, MetaData, text
-from typing import List, Dict, Optional
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from sqlalchemy import (
+    String, cast, column, create_engine, inspect, literal, make_url, MetaData, select, table as table_clause,
+    text, union_all
+)
+from sqlalchemy.exc import NoSuchTableError
+from typing import Dict, Iterator, List, Optional
 from langchain_openai import ChatOpenAI
 from src.config import get_settings
 
 
+# Reflected tables, LLM descriptions and column samples are persisted here per database
+SCHEMA_CACHE_DIR = Path(".schema_cache")
+
+# Tables described per LLM request when generating descriptions in bulk
+DESCRIPTION_BATCH_TABLES = 20
+
+# Threads used to render enhanced table DDL in parallel
+SCHEMA_WORKERS = 8
+
+
+# Column description prompts; only the table/column listing varies per request
+_COLUMN_DESCRIPTION_PROMPT = """You are a database expert. Generate concise, helpful descriptions for each column in the {table_name} table.
+
+Table: {table_name}
+Columns:
+{columns}
+
+For each column, provide a brief, clear description (5-10 words) that explains what the column contains.
+Focus on making it easy for someone to write SQL queries.
+
+Rules:
+1. For ID columns: mention if it's a primary key or references another table
+2. For name/title columns: specify what kind of name (person, product, song, etc.)
+3. For date/time columns: specify what event or action it represents
+4. For amount/price columns: specify what it measures
+5. Be specific and avoid generic terms
+
+Respond with a JSON object mapping each column name to its description, for example:
+{{"customer_id": "Unique identifier for each customer", "first_name": "Customer's first name", "order_date": "Date when the order was placed", "total_amount": "Total cost of the order in dollars"}}"""
+
+_BATCH_DESCRIPTION_PROMPT = """You are a database expert. Generate concise, helpful descriptions for each column in the tables below.
+
+{tables}
+
+For each column, provide a brief, clear description (5-10 words) that explains what the column contains.
+Focus on making it easy for someone to write SQL queries.
+
+Rules:
+1. For ID columns: mention if it's a primary key or references another table
+2. For name/title columns: specify what kind of name (person, product, song, etc.)
+3. For date/time columns: specify what event or action it represents
+4. For amount/price columns: specify what it measures
+5. Be specific and avoid generic terms
+
+Respond with a JSON object mapping "table.column" to its description, for example:
+{{"customers.customer_id": "Unique identifier for each customer", "orders.order_date": "Date when the order was placed"}}"""
+
+
 class SchemaExtractor:
     """Extract and manage database schema information with intelligent descriptions."""
     
@@ -18,10 +78,10 @@ class SchemaExtractor:
             use_llm_descriptions: Whether to use LLM for generating column descriptions
         """
         self.engine = create_engine(database_url)
-        self.metadata = MetaData()
-        self.metadata.reflect(bind=self.engine)
+        self._metadata = None
         self._schema_cache = None
         self._enhanced_schema_cache = None
+        self._table_ddl_cache = {}
         self.use_llm_descriptions = use_llm_descriptions
         
         # Initialize LLM for descriptions if enabled
@@ -32,6 +92,149 @@ class SchemaExtractor:
                 temperature=0.1,  # Low temperature for consistent descriptions
                 openai_api_key=settings.openai_api_key
             )
+        
+        # Load persisted reflection/description/sample caches instead of re-reflecting
+        self._cache_path = SCHEMA_CACHE_DIR / f"{hashlib.sha256(database_url.encode()).hexdigest()}.pkl"
+        # Guards _cache, which rendering worker threads update while it may be pickled
+        self._cache_lock = threading.RLock()
+        self._cache = self._load_cache() or self._empty_cache(version=0)
+        self._cache_dirty = False
+        
+        # A database whose fingerprint changed since the cache was written may have a different schema
+        fingerprint = self._fingerprint(database_url)
+        if fingerprint is None or self._cache.get("fingerprint") != fingerprint:
+            self.refresh()
+            self._cache["fingerprint"] = fingerprint
+            self._cache_dirty = True
+            self._save_cache()
+    
+    @property
+    def metadata(self) -> MetaData:
+        """Reflected SQLAlchemy metadata (reflected lazily on first access)."""
+        if self._metadata is None:
+            self._metadata = MetaData()
+            self._metadata.reflect(bind=self.engine)
+        return self._metadata
+    
+    @staticmethod
+    def _empty_cache(version: int) -> Dict:
+        """Create an empty persistent cache."""
+        return {
+            "version": version,
+            "table_names": None,
+            "tables": {},
+            "descriptions": {},
+            "samples": {},
+            "full_schema": {},
+            "fingerprint": None
+        }
+    
+    def _fingerprint(self, database_url: str) -> Optional[str]:
+        """Value that changes whenever the database schema may have changed (None if unknown)."""
+        # A SQLite file's modification time is free to read and also catches data changes
+        db_mtime = self._db_mtime(database_url)
+        if db_mtime is not None:
+            return f"mtime:{db_mtime}"
+        
+        # Other databases: hash every table's column names and types (one reflection query)
+        try:
+            columns = inspect(self.engine).get_multi_columns()
+        except Exception:
+            return None
+        signature = sorted(
+            f"{schema}.{table}.{col['name']} {col['type']}"
+            for (schema, table), table_columns in columns.items()
+            for col in table_columns
+        )
+        return "schema:" + hashlib.blake2b("\n".join(signature).encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _db_mtime(database_url: str) -> Optional[float]:
+        """Modification time of a SQLite database file (None for other databases)."""
+        url = make_url(database_url)
+        if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+            return None
+        try:
+            return os.path.getmtime(url.database)
+        except OSError:
+            return None
+    
+    def _load_cache(self) -> Optional[Dict]:
+        """Load the persisted schema cache, or None if missing or unreadable."""
+        try:
+            with open(self._cache_path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+    
+    def _save_cache(self):
+        """Persist the schema cache if anything changed."""
+        with self._cache_lock:
+            if not self._cache_dirty:
+                return
+            
+            tmp_path = None
+            try:
+                self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # A temp file of our own, so concurrent writers never interleave in one file
+                with tempfile.NamedTemporaryFile(dir=self._cache_path.parent, suffix=".tmp", delete=False) as f:
+                    tmp_path = f.name
+                    pickle.dump(self._cache, f)
+                os.replace(tmp_path, self._cache_path)
+                self._cache_dirty = False
+            except Exception as e:
+                print(f"Warning: Failed to save schema cache: {e}")
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    
+    def refresh(self):
+        """Discard cached schema information and bump the stored schema version."""
+        with self._cache_lock:
+            # Descriptions are keyed by table content, so they stay valid for unchanged tables
+            descriptions = self._cache["descriptions"]
+            self._cache = self._empty_cache(version=self._cache.get("version", 0) + 1)
+            self._cache["descriptions"] = descriptions
+            self._cache_dirty = True
+            self._metadata = None
+            self._schema_cache = None
+            self._enhanced_schema_cache = None
+            self._table_ddl_cache = {}
+            self._save_cache()
+    
+    def _reflect_tables(self, table_names: List[str]):
+        """Reflect columns, primary keys and foreign keys for uncached tables in bulk."""
+        # Held throughout so concurrent renders don't reflect the same tables twice
+        with self._cache_lock:
+            missing = [t for t in dict.fromkeys(table_names) if t not in self._cache["tables"]]
+            if not missing:
+                return
+            
+            # One multi-table query per kind of metadata instead of three per table
+            inspector = inspect(self.engine)
+            columns = inspector.get_multi_columns(filter_names=missing)
+            pks = inspector.get_multi_pk_constraint(filter_names=missing)
+            fks = inspector.get_multi_foreign_keys(filter_names=missing)
+            
+            for table_name in missing:
+                key = (None, table_name)
+                if key not in columns:
+                    continue
+                self._cache["tables"][table_name] = {
+                    # Store types as their DDL strings so the cache pickles independently of the dialect
+                    "columns": [{**col, "type": str(col["type"])} for col in columns[key]],
+                    "pk": pks.get(key, {}),
+                    "fks": fks.get(key, [])
+                }
+                self._cache_dirty = True
+    
+    def _table_info(self, table_name: str) -> Dict:
+        """Get columns, primary key and foreign keys for a table (cached)."""
+        if table_name not in self._cache["tables"]:
+            # Reflect the rest of the schema alongside it; callers usually walk every table
+            self._reflect_tables([table_name, *self.get_table_names()])
+            if table_name not in self._cache["tables"]:
+                raise NoSuchTableError(table_name)
+        return self._cache["tables"][table_name]
     
     def get_full_schema(self, enhanced: bool = True) -> str:
         """
@@ -48,17 +251,39 @@ class SchemaExtractor:
         elif not enhanced and self._schema_cache:
             return self._schema_cache
         
-        inspector = inspect(self.engine)
-        schema_parts = []
-        
-        for table_name in inspector.get_table_names():
+        # Rendered schema from an earlier run (dropped whenever the cache is refreshed)
+        full_key = (enhanced, enhanced and self.use_llm_descriptions)
+        result = self._cache["full_schema"].get(full_key)
+        if result is not None:
             if enhanced:
-                schema_parts.append(self._get_enhanced_table_ddl(table_name, inspector))
+                self._enhanced_schema_cache = result
             else:
-                schema_parts.append(self._get_table_ddl(table_name, inspector))
+                self._schema_cache = result
+            return result
+        
+        table_names = self.get_table_names()
+        self._reflect_tables(table_names)
+        
+        # Describe every table up front instead of one LLM call per table
+        if enhanced and self.use_llm_descriptions:
+            self._generate_all_column_descriptions(table_names)
+        
+        if enhanced and table_names:
+            # Sampling queries (and any per-table LLM fallbacks) are I/O-bound and independent
+            with ThreadPoolExecutor(max_workers=min(SCHEMA_WORKERS, len(table_names))) as pool:
+                schema_parts = list(pool.map(self._render_table, table_names))
+        else:
+            schema_parts = [self._render_table(table_name, enhanced) for table_name in table_names]
         
         result = "\n\n".join(schema_parts)
         
+        # Persist unless some table fell back to heuristics after a failed LLM call
+        if not full_key[1] or all(self._description_key(t) in self._cache["descriptions"] for t in table_names):
+            with self._cache_lock:
+                self._cache["full_schema"][full_key] = result
+                self._cache_dirty = True
+        self._save_cache()
+        
         if enhanced:
             self._enhanced_schema_cache = result
         else:
@@ -66,11 +291,42 @@ class SchemaExtractor:
         
         return result
     
-    def _get_table_ddl(self, table_name: str, inspector) -> str:
+    def iter_full_schema(self, enhanced: bool = True) -> Iterator[str]:
+        """
+        Yield the complete schema one table at a time.
+        
+        Joining the chunks gives the same text as get_full_schema, without the
+        caller holding the whole schema as one string (e.g. when writing to a file).
+        
+        Args:
+            enhanced: If True, includes LLM-generated descriptions and sample values
+        """
+        table_names = self.get_table_names()
+        self._reflect_tables(table_names)
+        
+        if enhanced and self.use_llm_descriptions:
+            self._generate_all_column_descriptions(table_names)
+        
+        for i, table_name in enumerate(table_names):
+            yield ("\n\n" if i else "") + self._render_table(table_name, enhanced)
+        
+        self._save_cache()
+    
+    def _render_table(self, table_name: str, enhanced: bool = True) -> str:
+        """Get DDL for a table, rendering it only on first request."""
+        key = (table_name, enhanced)
+        ddl = self._table_ddl_cache.get(key)
+        if ddl is None:
+            ddl = self._get_enhanced_table_ddl(table_name) if enhanced else self._get_table_ddl(table_name)
+            self._table_ddl_cache[key] = ddl
+        return ddl
+    
+    def _get_table_ddl(self, table_name: str) -> str:
         """Generate basic DDL for a single table."""
-        columns = inspector.get_columns(table_name)
-        pk_constraint = inspector.get_pk_constraint(table_name)
-        fk_constraints = inspector.get_foreign_keys(table_name)
+        info = self._table_info(table_name)
+        columns = info["columns"]
+        pk_constraint = info["pk"]
+        fk_constraints = info["fks"]
         
         ddl = f"CREATE TABLE {table_name} (\n"
         
@@ -99,17 +355,47 @@ class SchemaExtractor:
         
         return ddl
     
-    def _get_enhanced_table_ddl(self, table_name: str, inspector) -> str:
-        """Generate enhanced DDL with LLM descriptions and sample values."""
-        columns = inspector.get_columns(table_name)
-        pk_constraint = inspector.get_pk_constraint(table_name)
-        fk_constraints = inspector.get_foreign_keys(table_name)
+    def _table_metadata(self, table_name: str) -> Dict:
+        """Get columns, keys, descriptions and sample values for a table (cached)."""
+        info = self._table_info(table_name)
+        columns = info["columns"]
         
         # Get column descriptions (LLM-powered if enabled)
-        column_descriptions = self._generate_column_descriptions(table_name, columns, fk_constraints)
+        column_descriptions = self._generate_column_descriptions(table_name, columns, info["fks"])
         
         # Get sample values for each column
-        column_samples = self._get_column_samples(table_name, [col['name'] for col in columns])
+        column_samples = self._cache["samples"].get(table_name)
+        if column_samples is None:
+            column_samples = self._get_column_samples(table_name, [col['name'] for col in columns])
+            with self._cache_lock:
+                self._cache["samples"][table_name] = column_samples
+                self._cache_dirty = True
+        
+        return {
+            "columns": columns,
+            "pk": info["pk"],
+            "fks": info["fks"],
+            "descriptions": column_descriptions,
+            "samples": column_samples
+        }
+    
+    @staticmethod
+    def column_comment(column_name: str, metadata: Dict) -> str:
+        """Comment text for a column: its description plus sample values if available."""
+        description = metadata["descriptions"].get(column_name, column_name.replace('_', ' ').title())
+        
+        samples = metadata["samples"].get(column_name)
+        if samples:
+            sample_str = ", ".join([f'"{s}"' for s in samples[:5]])
+            return f"{description} (e.g., {sample_str})"
+        return description
+    
+    def _get_enhanced_table_ddl(self, table_name: str) -> str:
+        """Generate enhanced DDL with LLM descriptions and sample values."""
+        metadata = self._table_metadata(table_name)
+        columns = metadata["columns"]
+        pk_constraint = metadata["pk"]
+        fk_constraints = metadata["fks"]
         
         ddl = f"CREATE TABLE {table_name} (\n"
         
@@ -124,16 +410,8 @@ class SchemaExtractor:
             if not col.get('nullable', True):
                 col_def += " NOT NULL"
             
-            # Add intelligent description
-            description = column_descriptions.get(col_name, col_name.replace('_', ' ').title())
-            
-            # Add sample values if available
-            if col_name in column_samples and column_samples[col_name]:
-                samples = column_samples[col_name]
-                sample_str = ", ".join([f'"{s}"' for s in samples[:5]])
-                col_def += f"  -- {description} (e.g., {sample_str})"
-            else:
-                col_def += f"  -- {description}"
+            # Add intelligent description and sample values
+            col_def += f"  -- {self.column_comment(col_name, metadata)}"
             
             col_defs.append(col_def)
         
@@ -150,6 +428,89 @@ class SchemaExtractor:
         
         return ddl
     
+    @staticmethod
+    def _column_info_lines(columns: List[Dict], fk_constraints: List[Dict]) -> List[str]:
+        """Describe columns (name, type, foreign key target) for a description prompt."""
+        # Build foreign key map
+        fk_map = {}
+        for fk in fk_constraints:
+            for col in fk['constrained_columns']:
+                fk_map[col] = {
+                    'table': fk['referred_table'],
+                    'column': fk['referred_columns'][0]
+                }
+        
+        column_info = []
+        for col in columns:
+            fk_info = ""
+            if col['name'] in fk_map:
+                fk_info = f" (foreign key to {fk_map[col['name']]['table']}.{fk_map[col['name']]['column']})"
+            
+            column_info.append(f"- {col['name']} ({col['type']}){fk_info}")
+        
+        return column_info
+    
+    def _description_key(self, table_name: str) -> str:
+        """Cache key for a table's descriptions: a hash of everything the description prompt shows."""
+        info = self._table_info(table_name)
+        spec = [table_name, [(col["name"], col["type"]) for col in info["columns"]], info["fks"]]
+        return hashlib.blake2b(json.dumps(spec, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+    
+    def _generate_all_column_descriptions(self, table_names: List[str]):
+        """
+        Generate LLM descriptions for many tables with one request per batch of tables.
+        
+        Batches are sent concurrently. Results are stored in the description cache, where
+        _generate_column_descriptions picks them up. Tables the response doesn't cover fall
+        back to per-table requests.
+        
+        Args:
+            table_names: Tables to describe
+        """
+        pending = [t for t in table_names if self._description_key(t) not in self._cache["descriptions"]]
+        batches = [
+            pending[start:start + DESCRIPTION_BATCH_TABLES]
+            for start in range(0, len(pending), DESCRIPTION_BATCH_TABLES)
+        ]
+        if not batches:
+            return
+        
+        # Requests are latency-bound; only the cache update below touches shared state
+        with ThreadPoolExecutor(max_workers=min(SCHEMA_WORKERS, len(batches))) as pool:
+            results = list(pool.map(self._describe_batch, batches))
+        
+        with self._cache_lock:
+            for descriptions in results:
+                for table_name, table_descriptions in descriptions.items():
+                    if table_descriptions:
+                        self._cache["descriptions"][self._description_key(table_name)] = table_descriptions
+                        self._cache_dirty = True
+    
+    def _describe_batch(self, batch: List[str]) -> Dict[str, Dict[str, str]]:
+        """Describe the columns of a batch of tables in one LLM request (empty on failure)."""
+        sections = []
+        for table_name in batch:
+            info = self._table_info(table_name)
+            column_info = self._column_info_lines(info["columns"], info["fks"])
+            sections.append(f"### {table_name}\n" + "\n".join(column_info))
+        
+        prompt = _BATCH_DESCRIPTION_PROMPT.format(tables="\n".join(sections))
+        
+        try:
+            response = self.llm.bind(response_format={"type": "json_object"}).invoke(prompt)
+            parsed = json.loads(response.content)
+        except Exception as e:
+            print(f"Warning: Batched LLM descriptions failed for {len(batch)} tables: {e}")
+            return {}
+        
+        descriptions = {table_name: {} for table_name in batch}
+        for key, desc in parsed.items():
+            table_name, _, col_name = str(key).partition('.')
+            if table_name in descriptions and col_name:
+                descriptions[table_name][col_name.strip()] = str(desc).strip()
+        
+        return descriptions
+    
     def _generate_column_descriptions(self, table_name: str, columns: List[Dict], fk_constraints: List[Dict]) -> Dict[str, str]:
         """
         Generate intelligent descriptions for columns using LLM.
@@ -167,61 +528,31 @@ class SchemaExtractor:
             return {col['name']: self._heuristic_description(col['name'], table_name) 
                     for col in columns}
         
+        # Reuse descriptions from an earlier run
+        key = self._description_key(table_name)
+        if key in self._cache["descriptions"]:
+            return self._cache["descriptions"][key]
+        
         try:
-            # Build foreign key map
-            fk_map = {}
-            for fk in fk_constraints:
-                for col in fk['constrained_columns']:
-                    fk_map[col] = {
-                        'table': fk['referred_table'],
-                        'column': fk['referred_columns'][0]
-                    }
-            
             # Create prompt for LLM
-            column_info = []
-            for col in columns:
-                fk_info = ""
-                if col['name'] in fk_map:
-                    fk_info = f" (foreign key to {fk_map[col['name']]['table']}.{fk_map[col['name']]['column']})"
-                
-                column_info.append(f"- {col['name']} ({col['type']}){fk_info}")
+            column_info = self._column_info_lines(columns, fk_constraints)
+            
+            prompt = _COLUMN_DESCRIPTION_PROMPT.format(table_name=table_name, columns="\n".join(column_info))
             
-            prompt = f"""You are a database expert. Generate concise, helpful descriptions for each column in the {table_name} table.
-
-Table: {table_name}
-Columns:
-{chr(10).join(column_info)}
-
-For each column, provide a brief, clear description (5-10 words) that explains what the column contains.
-Focus on making it easy for someone to write SQL queries.
-
-Rules:
-1. For ID columns: mention if it's a primary key or references another table
-2. For name/title columns: specify what kind of name (person, product, song, etc.)
-3. For date/time columns: specify what event or action it represents
-4. For amount/price columns: specify what it measures
-5. Be specific and avoid generic terms
-
-Respond in this format (one line per column):
-column_name: description
-
-Example:
-customer_id: Unique identifier for each customer
-first_name: Customer's first name
-order_date: Date when the order was placed
-total_amount: Total cost of the order in dollars"""
-
             # Get descriptions from LLM
-            response = self.llm.invoke(prompt)
-            descriptions = {}
+            response = self.llm.bind(response_format={"type": "json_object"}).invoke(prompt)
+            descriptions = {
+                str(col_name).strip(): str(desc).strip()
+                for col_name, desc in json.loads(response.content).items()
+            }
             
-            for line in response.content.strip().split('\n'):
-                if ':' in line:
-                    col_name, desc = line.split(':', 1)
-                    descriptions[col_name.strip()] = desc.strip()
+            # Only successful LLM descriptions are persisted; heuristics are cheap to redo
+            with self._cache_lock:
+                self._cache["descriptions"][key] = descriptions
+                self._cache_dirty = True
             
             return descriptions
-            
+        
         except Exception as e:
             # Fallback to heuristics if LLM fails
             print(f"Warning: LLM description failed for {table_name}, using heuristics: {e}")
@@ -265,24 +596,58 @@ total_amount: Total cost of the order in dollars"""
             Dictionary mapping column names to sample values
         """
         samples = {}
+        column_names = list(column_names)
+        if not column_names:
+            return samples
+        
+        # Distinct non-null values per column, all columns in one UNION ALL round-trip
+        table = table_clause(table_name)
+        per_column = [
+            select(literal(i).label("col"), cast(distinct_values.c.v, String).label("v"))
+            for i, col_name in enumerate(column_names)
+            for distinct_values in [
+                select(column(col_name).label("v")).select_from(table)
+                .where(column(col_name).is_not(None)).distinct().limit(limit).subquery()
+            ]
+        ]
         
         try:
             with self.engine.connect() as conn:
-                for col_name in column_names:
-                    try:
-                        # Get distinct values
-                        query = text(f"SELECT DISTINCT {col_name} FROM {table_name} WHERE {col_name} IS NOT NULL LIMIT {limit}")
-                        result = conn.execute(query)
-                        values = [str(row[0]) for row in result.fetchall()]
-                        
-                        # Filter out very long values (probably not useful as examples)
-                        values = [v for v in values if len(str(v)) < 50]
-                        
-                        if values:
-                            samples[col_name] = values
-                    except Exception:
-                        # Skip columns that can't be sampled
-                        continue
+                rows = conn.execute(union_all(*per_column)).fetchall()
+        except Exception:
+            # Some column can't be sampled; query them one at a time and skip the failures
+            rows = []
+            try:
+                with self.engine.connect() as conn:
+                    for query in per_column:
+                        try:
+                            rows.extend(conn.execute(query).fetchall())
+                        except Exception:
+                            conn.rollback()
+            except Exception as e:
+                print(f"Warning: Failed to get column samples for {table_name}: {e}")
+        
+        for i, value in rows:
+            # Filter out very long values (probably not useful as examples)
+            if len(str(value)) < 50:
+                samples.setdefault(column_names[i], []).append(str(value))
+        
+        return samples
+        
+        try:
+            # One query per table instead of one SELECT DISTINCT per column
+            with self.engine.connect() as conn:
+                query = text(f"SELECT {', '.join(column_names)} FROM {table_name} LIMIT :sample_rows")
+                rows = conn.execute(query, {"sample_rows": sample_rows}).fetchall()
+            
+            for i, col_name in enumerate(column_names):
+                # Distinct, order-preserving; skip NULLs and very long values (not useful as examples)
+                values = dict.fromkeys(
+                    value for value in (str(row[i]) for row in rows if row[i] is not None)
+                    if len(value) < 50
+                )
+                if values:
+                    samples[col_name] = list(values)[:limit]
         except Exception as e:
             print(f"Warning: Failed to get column samples for {table_name}: {e}")
         
@@ -290,8 +655,12 @@ total_amount: Total cost of the order in dollars"""
     
     def get_table_names(self) -> List[str]:
         """Get list of all table names in the database."""
-        inspector = inspect(self.engine)
-        return inspector.get_table_names()
+        with self._cache_lock:
+            if self._cache["table_names"] is None:
+                self._cache["table_names"] = inspect(self.engine).get_table_names()
+                self._cache_dirty = True
+                self._save_cache()
+            return list(self._cache["table_names"])
     
     def get_table_schema(self, table_name: str, enhanced: bool = True) -> str:
         """
@@ -301,15 +670,41 @@ total_amount: Total cost of the order in dollars"""
             table_name: Name of the table
             enhanced: Whether to include LLM descriptions and samples
         """
-        inspector = inspect(self.engine)
-        if enhanced:
-            return self._get_enhanced_table_ddl(table_name, inspector)
-        else:
-            return self._get_table_ddl(table_name, inspector)
+        ddl = self._render_table(table_name, enhanced)
+        self._save_cache()
+        return ddl
+    
+    def get_tables_schema(self, table_names: List[str], enhanced: bool = True) -> List[str]:
+        """
+        Get schema for several tables, reusing DDL rendered earlier.
+        
+        Args:
+            table_names: Names of the tables
+            enhanced: Whether to include LLM descriptions and samples
+        
+        Returns:
+            DDL for each table, in the same order
+        """
+        ddls = [self._render_table(table_name, enhanced) for table_name in table_names]
+        self._save_cache()
+        return ddls
+    
+    def get_table_metadata(self, table_name: str) -> Dict:
+        """
+        Get table metadata without rendering or re-parsing DDL.
+        
+        Args:
+            table_name: Name of the table
+        
+        Returns:
+            Dict with 'columns', 'pk', 'fks', 'descriptions' and 'samples'
+        """
+        metadata = self._table_metadata(table_name)
+        self._save_cache()
+        return metadata
     
     def get_sample_data(self, table_name: str, limit: int = 3) -> List[Dict]:
         """Get sample rows from a table."""
         with self.engine.connect() as conn:
-            result = conn.execute(text(f"SELECT * FROM {table_name} LIMIT {limit}"))
-            columns = result.keys()
-            return [dict(zip(columns, row)) for row in result.fetchall()]
+            result = conn.execute(text(f"SELECT * FROM {table_name} LIMIT :limit"), {"limit": limit})
+            return [dict(row) for row in result.mappings()]
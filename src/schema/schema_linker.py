@@ -1,55 +1,130 @@
 """Schema linking using TF-IDF similarity."""
 
+import hashlib
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+import sklearn
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from typing import List, Tuple
 import numpy as np
-from .schema_extractor import SchemaExtractor
+from .schema_extractor import SCHEMA_CACHE_DIR, SchemaExtractor
 
 
 class SchemaLinker:
     """Link natural language questions to relevant database tables."""
     
-    def __init__(self, schema_extractor: SchemaExtractor):
-        """Initialize schema linker with schema information."""
+    def __init__(self, schema_extractor: SchemaExtractor, embeddings=None):
+        """
+        Initialize schema linker with schema information.
+        
+        Args:
+            schema_extractor: Source of table metadata
+            embeddings: Optional LangChain embeddings model; when given, tables are ranked by
+                embedding similarity (catches paraphrases TF-IDF misses), falling back to TF-IDF
+        """
         self.schema_extractor = schema_extractor
         self.table_names = schema_extractor.get_table_names()
-        self.vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
         
         # Create corpus for each table (name + column names + descriptions)
         self.table_corpus = self._build_table_corpus()
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.table_corpus)
+        self.vectorizer, self.tfidf_matrix = self._fit()
+        
+        # Rows are L2-normalized, so cosine similarity is a plain product with the transpose
+        self._tfidf_T = self.tfidf_matrix.T.tocsr()
+        
+        # Repeat questions skip tokenization and n-gram extraction
+        self._vectorize = lru_cache(maxsize=2048)(self._transform)
+        
+        # Dense table embeddings, computed once in a single batched request
+        self.embeddings = embeddings
+        self._table_embeddings = None
+        if embeddings is not None:
+            try:
+                self._table_embeddings = self._normalize(embeddings.embed_documents(self.table_corpus))
+                self._embed = lru_cache(maxsize=2048)(self._embed_question)
+            except Exception as e:
+                print(f"Warning: Table embeddings failed, using TF-IDF schema linking: {e}")
+    
+    def _fit(self):
+        """Fit TF-IDF on the table corpus, reusing a persisted fit of the same corpus."""
+        # Keyed by corpus and sklearn version, so schema or library changes refit
+        key = hashlib.sha256("\x00".join([sklearn.__version__, *self.table_corpus]).encode()).hexdigest()
+        path = SCHEMA_CACHE_DIR / f"tfidf-{key}.pkl"
+        
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass
+        
+        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
+        fitted = (vectorizer, vectorizer.fit_transform(self.table_corpus))
+        
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # A temp file of our own, so linkers fitting the same corpus never share one
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                pickle.dump(fitted, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: Failed to save TF-IDF cache: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        return fitted
+    
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        """Scale rows to unit length so a dot product is cosine similarity."""
+        matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return matrix / norms
+    
+    def _embed_question(self, question: str) -> np.ndarray:
+        """Embed a question as a unit vector."""
+        return self._normalize(self.embeddings.embed_query(question))[0]
+    
+    def _transform(self, question: str):
+        """Vectorize a normalized question."""
+        return self.vectorizer.transform([question])
     
     def _build_table_corpus(self) -> List[str]:
         """Build text corpus for each table."""
         corpus = []
         
         for table_name in self.table_names:
-            # Get table schema
-            schema = self.schema_extractor.get_table_schema(table_name)
+            # Use cached metadata directly instead of parsing rendered DDL
+            metadata = self.schema_extractor.get_table_metadata(table_name)
             
-            # Extract meaningful text (table name, column names, comments)
+            # Table name, column names and column comments (descriptions and samples)
             text_parts = [table_name.replace("_", " ")]
-            
-            # Parse schema to extract column names and comments
-            for line in schema.split('\n'):
-                line = line.strip()
-                if line and not line.startswith('CREATE') and not line.startswith('FOREIGN'):
-                    # Extract column name
-                    parts = line.split()
-                    if parts:
-                        col_name = parts[0].replace("_", " ")
-                        text_parts.append(col_name)
-                    
-                    # Extract comment if present
-                    if '--' in line:
-                        comment = line.split('--')[1].strip()
-                        text_parts.append(comment)
+            for col in metadata["columns"]:
+                text_parts.append(col["name"].replace("_", " "))
+                text_parts.append(self.schema_extractor.column_comment(col["name"], metadata))
             
             corpus.append(" ".join(text_parts))
         
         return corpus
     
+    def _similarities(self, question: str) -> np.ndarray:
+        """Cosine similarity of the question to every table."""
+        if self._table_embeddings is not None:
+            try:
+                return self._table_embeddings @ self._embed(question)
+            except Exception as e:
+                print(f"Warning: Question embedding failed, using TF-IDF schema linking: {e}")
+        
+        # Vectorize the question
+        question_vector = self._vectorize(question.lower())
+        
+        # Calculate cosine similarity
+        return (question_vector @ self._tfidf_T).toarray().ravel()
+    
     def link_tables(self, question: str, top_k: int = 3) -> List[Tuple[str, float]]:
         """
         Find the most relevant tables for a given question.
@@ -61,30 +136,42 @@ class SchemaLinker:
         Returns:
             List of (table_name, similarity_score) tuples
         """
-        # Vectorize the question
-        question_vector = self.vectorizer.transform([question.lower()])
+        similarities = self._similarities(question)
         
-        # Calculate cosine similarity
-        similarities = cosine_similarity(question_vector, self.tfidf_matrix)[0]
+        # Only tables with non-zero similarity are candidates
+        candidates = np.flatnonzero(similarities > 0)
+        
+        # Get top-k candidates without sorting the full table list
+        if top_k < len(candidates):
+            candidates = candidates[np.argpartition(similarities[candidates], -top_k)[-top_k:]]
+        top_indices = candidates[np.lexsort((candidates, similarities[candidates]))][::-1]
         
-        # Get top-k tables
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
+        return [(self.table_names[idx], similarities[idx]) for idx in top_indices]
+    
+    def link_and_render(self, question: str, top_k: int = 3) -> Tuple[List[Tuple[str, float]], str]:
+        """
+        Rank tables and render their schema in a single pass.
         
-        results = [
-            (self.table_names[idx], similarities[idx])
-            for idx in top_indices
-            if similarities[idx] > 0  # Only return tables with non-zero similarity
+        Args:
+            question: Natural language question
+            top_k: Number of top tables to return
+        
+        Returns:
+            (list of (table_name, similarity_score) tuples, schema DDL for those tables)
+        """
+        relevant_tables = self.link_tables(question, top_k)
+        
+        if not relevant_tables:
+            return relevant_tables, ""
+        
+        schemas = self.schema_extractor.get_tables_schema([table_name for table_name, _ in relevant_tables])
+        schema_parts = [
+            f"-- Relevance: {score:.2f}\n{schema}"
+            for (_, score), schema in zip(relevant_tables, schemas)
         ]
         
-        return results
+        return relevant_tables, "\n\n".join(schema_parts)
     
     def get_relevant_schema(self, question: str, top_k: int = 3) -> str:
         """Get schema DDL for only the relevant tables."""
-        relevant_tables = self.link_tables(question, top_k)
-        
-        schema_parts = []
-        for table_name, score in relevant_tables:
-            schema = self.schema_extractor.get_table_schema(table_name)
-            schema_parts.append(f"-- Relevance: {score:.2f}\n{schema}")
-        
-        return "\n\n".join(schema_parts)
+        return self.link_and_render(question, top_k)[1]
@@ -1,8 +1,10 @@
 """LangGraph workflow for Text-to-SQL conversion."""
 
+import asyncio
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
-from typing import Literal
-from ..agents.state import SQLState
+from typing import Dict, List, Literal
+from ..agents.state import INITIAL_STATE, SQLState
 from ..agents.schema_linker_node import schema_linker_node
 from ..agents.sql_generator import sql_generator_node
 from ..agents.validator import validator_node
@@ -11,8 +13,16 @@ from ..agents.self_corrector import corrector_node
 from ..config import get_settings
 
 
+# Upper bound on workflow runs in flight at once (keeps within OpenAI rate limits)
+MAX_CONCURRENCY = 8
+
+
+@lru_cache(maxsize=1)
 def create_workflow() -> StateGraph:
-    """Create the LangGraph workflow for Text-to-SQL."""
+    """Create the LangGraph workflow for Text-to-SQL (compiled once per process)."""
+    
+    # Routers run on every transition; read the limit once
+    max_attempts = get_settings().max_correction_attempts
     
     # Create the graph
     workflow = StateGraph(SQLState)
@@ -27,28 +37,24 @@ def create_workflow() -> StateGraph:
     # Define routing logic
     def should_correct(state: SQLState) -> Literal["corrector", "executor"]:
         """Decide if we need to correct the SQL or proceed to execution."""
-        settings = get_settings()
-        
         # Check if we've exceeded max correction attempts
-        if state.get("correction_attempt", 0) >= settings.max_correction_attempts:
+        if state.correction_attempt >= max_attempts:
             return "executor"  # Give up and try to execute anyway
         
         # Check validation results
-        if not state.get("is_valid_syntax", True) or not state.get("is_valid_semantics", True):
+        if not state.is_valid_syntax or not state.is_valid_semantics:
             return "corrector"
         
         return "executor"
     
     def should_retry_after_execution(state: SQLState) -> Literal["corrector", END]:
         """Decide if we need to retry after execution failure."""
-        settings = get_settings()
-        
         # Check if execution was successful
-        if state.get("execution_successful", False):
+        if state.execution_successful:
             return END
         
         # Check if we've exceeded max correction attempts
-        if state.get("correction_attempt", 0) >= settings.max_correction_attempts:
+        if state.correction_attempt >= max_attempts:
             return END  # Give up
         
         return "corrector"
@@ -82,3 +88,26 @@ def create_workflow() -> StateGraph:
 
 # Create the compiled workflow
 text_to_sql_workflow = create_workflow()
+
+
+async def run_many(questions: List[str], max_concurrency: int = MAX_CONCURRENCY) -> List[Dict]:
+    """
+    Run the workflow for several questions concurrently.
+    
+    LLM and validation nodes are async (sync nodes run in LangGraph's thread
+    pool), so one slow LLM call does not hold up the other runs.
+    
+    Args:
+        questions: Natural language questions
+        max_concurrency: Maximum number of runs in flight at once
+    
+    Returns:
+        Final states, in the same order as the questions
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_one(question: str) -> Dict:
+        async with semaphore:
+            return await text_to_sql_workflow.ainvoke({**INITIAL_STATE, "question": question})
+    
+    return await asyncio.gather(*(run_one(question) for question in questions))
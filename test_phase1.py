@@ -51,10 +51,12 @@ def test_enhanced_schema():
     print(f"\n📊 Sampling values from {len(tables)} tables...")
     
     for table in tables[:2]:  # Test first 2 tables
-        print(f"\n▶ {table}:")
         samples = extractor._get_column_samples(table, extractor.metadata.tables[table].columns.keys())
-        for col, values in list(samples.items())[:3]:  # Show first 3 columns
-            print(f"  {col}: {values}")
+        
+        # Buffer the table's lines and write them at once
+        lines = [f"\n▶ {table}:"]
+        lines.extend(f"  {col}: {values}" for col, values in list(samples.items())[:3])  # Show first 3 columns
+        sys.stdout.write("\n".join(lines) + "\n")
     
     # Test 3: Full Enhanced Schema
     print("\n" + "="*60)
@@ -62,19 +64,24 @@ def test_enhanced_schema():
     print("="*60)
     
     print("\n📚 Getting full enhanced schema for all tables...")
-    full_schema = extractor.get_full_schema(enhanced=True)
     
-    # Print first 500 characters to verify
-    print("\n✅ Full Enhanced Schema (first 1000 characters):")
-    print(full_schema[:1000])
-    print("\n... (total length: {} characters)".format(len(full_schema)))
-    
-    # Save to file for inspection
+    # Stream the schema to a file for inspection, one table at a time
     output_file = Path("test_enhanced_schema.txt")
+    preview = ""
+    total_length = 0
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write("ENHANCED SCHEMA WITH LLM DESCRIPTIONS\n")
         f.write("="*60 + "\n\n")
-        f.write(full_schema)
+        for chunk in extractor.iter_full_schema(enhanced=True):
+            f.write(chunk)
+            total_length += len(chunk)
+            if len(preview) < 1000:
+                preview += chunk[:1000 - len(preview)]
+    
+    # Print first 1000 characters to verify
+    print("\n✅ Full Enhanced Schema (first 1000 characters):")
+    print(preview)
+    print("\n... (total length: {} characters)".format(total_length))
     
     print(f"\n💾 Full schema saved to: {output_file}")
     
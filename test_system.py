@@ -5,52 +5,44 @@ This script tests basic functionality without requiring OpenAI API.
 
 import sys
 import os
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Precedes the JSON list of (name, passed) pairs a group's child process prints last
+_RESULTS_MARKER = "\n__RESULTS__ "
+
+
+@lru_cache(maxsize=None)
+def _get_extractor(database_url):
+    """Shared SchemaExtractor, so tests reuse one engine and reflection."""
+    from src.schema.schema_extractor import SchemaExtractor
+    return SchemaExtractor(database_url)
+
 
 def test_imports():
     """Test that all required packages are installed."""
-    print("Testing package imports...")
+    from importlib.util import find_spec
     
-    try:
-        import langgraph
-        print("✅ langgraph")
-    except ImportError as e:
-        print(f"❌ langgraph: {e}")
-        return False
-    
-    try:
-        import langchain
-        print("✅ langchain")
-    except ImportError as e:
-        print(f"❌ langchain: {e}")
-        return False
-    
-    try:
-        import sqlalchemy
-        print("✅ sqlalchemy")
-    except ImportError as e:
-        print(f"❌ sqlalchemy: {e}")
-        return False
-    
-    try:
-        import sqlparse
-        print("✅ sqlparse")
-    except ImportError as e:
-        print(f"❌ sqlparse: {e}")
-        return False
+    print("Testing package imports...")
     
-    try:
-        import sklearn
-        print("✅ scikit-learn")
-    except ImportError as e:
-        print(f"❌ scikit-learn: {e}")
-        return False
+    # Locating a package is enough to confirm installation; importing sklearn or
+    # langchain here would only add seconds of startup
+    packages = [
+        ("langgraph", "langgraph"),
+        ("langchain", "langchain"),
+        ("sqlalchemy", "sqlalchemy"),
+        ("sqlparse", "sqlparse"),
+        ("sklearn", "scikit-learn"),
+        ("dotenv", "python-dotenv"),
+    ]
     
-    try:
-        from dotenv import load_dotenv
-        print("✅ python-dotenv")
-    except ImportError as e:
-        print(f"❌ python-dotenv: {e}")
-        return False
+    for module, display_name in packages:
+        if find_spec(module) is None:
+            print(f"❌ {display_name}: No module named '{module}'")
+            return False
+        print(f"✅ {display_name}")
     
     return True
 
@@ -66,16 +58,19 @@ def test_database():
         return False
     
     try:
-        from sqlalchemy import create_engine, text
-        engine = create_engine(f"sqlite:///{db_path}")
+        import sqlite3
+        
+        # Count every table in one statement
+        tables = ['customers', 'products', 'orders', 'order_items']
+        query = " UNION ALL ".join(f"SELECT '{table}' AS name, COUNT(*) AS n FROM {table}" for table in tables)
         
-        with engine.connect() as conn:
-            # Test each table
-            tables = ['customers', 'products', 'orders', 'order_items']
-            for table in tables:
-                result = conn.execute(text(f"SELECT COUNT(*) FROM {table}"))
-                count = result.fetchone()[0]
+        # Plain read-only connection; no SQLAlchemy engine needed for a row count
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            for table, count in conn.execute(query).fetchall():
                 print(f"✅ {table}: {count} rows")
+        finally:
+            conn.close()
         
         return True
     except Exception as e:
@@ -88,9 +83,7 @@ def test_schema_extractor():
     print("\nTesting schema extractor...")
     
     try:
-        from src.schema.schema_extractor import SchemaExtractor
-        
-        extractor = SchemaExtractor("sqlite:///data/ecommerce.db")
+        extractor = _get_extractor("sqlite:///data/ecommerce.db")
         schema = extractor.get_full_schema()
         
         if "customers" in schema and "products" in schema:
@@ -111,10 +104,9 @@ def test_schema_linker():
     print("\nTesting schema linker...")
     
     try:
-        from src.schema.schema_extractor import SchemaExtractor
         from src.schema.schema_linker import SchemaLinker
         
-        extractor = SchemaExtractor("sqlite:///data/ecommerce.db")
+        extractor = _get_extractor("sqlite:///data/ecommerce.db")
         linker = SchemaLinker(extractor)
         
         # Test with a sample question
@@ -167,30 +159,71 @@ def test_validator():
         return False
 
 
-def main():
-    """Run all tests."""
-    print("="*60)
-    print("  NLP-to-SQL System Verification")
-    print("="*60)
-    
-    tests = [
-        ("Package Imports", test_imports),
-        ("Database", test_database),
-        ("Schema Extractor", test_schema_extractor),
-        ("Schema Linker", test_schema_linker),
-        ("SQL Validator", test_validator),
-    ]
-    
+TEST_GROUPS = [
+    [("Package Imports", test_imports)],
+    [("Database", test_database)],
+    # Both use the shared SchemaExtractor, which isn't thread-safe; run them in turn
+    [("Schema Extractor", test_schema_extractor), ("Schema Linker", test_schema_linker)],
+    [("SQL Validator", test_validator)],
+]
+
+
+def _run_group_here(index):
+    """Run one test group in this process, then print its results after the marker."""
     results = []
-    for name, test_func in tests:
+    for name, test_func in TEST_GROUPS[index]:
         try:
             result = test_func()
-            results.append((name, result))
         except Exception as e:
             print(f"❌ {name} test crashed: {e}")
-            results.append((name, False))
+            result = False
+        results.append((name, bool(result)))
         print()
     
+    sys.stdout.write(_RESULTS_MARKER + json.dumps(results) + "\n")
+
+
+def _run_group(index):
+    """
+    Run one test group in a child process.
+    
+    Everything the group writes, including stderr and prints from worker threads,
+    is captured together, so it can be shown in order once the group finishes.
+    
+    Returns:
+        (list of (name, passed), captured output)
+    """
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--group", str(index)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        encoding="utf-8",
+        env={**os.environ, "PYTHONIOENCODING": "utf-8"}
+    )
+    output, marker, results = proc.stdout.rpartition(_RESULTS_MARKER)
+    if not marker:
+        # The child died before reporting; count the whole group as failed
+        return [(name, False) for name, _ in TEST_GROUPS[index]], proc.stdout + "\n"
+    return [tuple(result) for result in json.loads(results)], output
+
+
+def main():
+    """Run all tests."""
+    print("="*60)
+    print("  NLP-to-SQL System Verification")
+    print("="*60)
+    
+    # Groups are independent and read-only; run each in its own process concurrently
+    # and print each group's captured output in order
+    with ThreadPoolExecutor(max_workers=len(TEST_GROUPS)) as pool:
+        futures = [pool.submit(_run_group, index) for index in range(len(TEST_GROUPS))]
+        
+        results = []
+        for future in futures:
+            group_results, text = future.result()
+            print(text, end="")
+            results.extend(group_results)
+    
     # Summary
     print("="*60)
     print("  Test Summary")
@@ -199,9 +232,10 @@ def main():
     passed = sum(1 for _, result in results if result)
     total = len(results)
     
-    for name, result in results:
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{status}: {name}")
+    # One write for the whole summary
+    sys.stdout.write("".join(
+        f"{'✅ PASS' if result else '❌ FAIL'}: {name}\n" for name, result in results
+    ))
     
     print(f"\nTotal: {passed}/{total} tests passed")
     
@@ -215,4 +249,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) == 3 and sys.argv[1] == "--group":
+        _run_group_here(int(sys.argv[2]))
+    else:
+        main()